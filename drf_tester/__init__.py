@@ -1 +1 @@
-from . import viewsets
+from . import matrix, viewsets
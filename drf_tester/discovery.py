@@ -0,0 +1,266 @@
+"""
+Discovery of the endpoints of a router or URLconf, and generation of their test classes
+
+In a tests module of your project:
+
+from drf_tester import discovery
+from your_project.routers import router
+
+from . import factories
+
+load_tests = discovery.get_load_tests(router, "/api/v1/", module=__name__, factories=factories, select=["things-*"])
+
+Test classes are only built when the tests are loaded, for the selected endpoints:
+- select: patterns (fnmatch) of the basename or path of endpoints
+- DRF_TESTER_ENDPOINTS environment variable: comma separated patterns, overriding select
+Access of each role is inferred from the permission_classes of the viewset (DRF permissions only),
+and the instance_data from a factory instance serialized with its serializer_class.
+
+"""
+import fnmatch
+import os
+import re
+import sys
+import unittest
+from typing import NamedTuple
+
+from django.test import SimpleTestCase
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework import permissions, status
+from rest_framework.test import APITestCase
+
+from .matrix import AccessMatrix
+from .utils import BaseDrfTest
+
+
+# Environment variable with comma separated patterns of the endpoints to test
+ENDPOINTS_ENV = "DRF_TESTER_ENDPOINTS"
+
+USER_DATA = {"username": "drf_tester_user", "password": "drf_tester_password"}
+ADMIN_DATA = {"username": "drf_tester_admin", "password": "drf_tester_password"}
+STAFF_DATA = {"username": "drf_tester_staff", "password": "drf_tester_password"}
+
+# Roles allowed by DRF permissions, for safe (read) and unsafe (write) requests
+PERMISSIONS = {
+    permissions.AllowAny: lambda role, safe: True,
+    permissions.IsAuthenticated: lambda role, safe: role != "anon",
+    permissions.IsAuthenticatedOrReadOnly: lambda role, safe: safe or role != "anon",
+    permissions.IsAdminUser: lambda role, safe: role == "staff",
+}
+
+ACTIONS = {
+    "list": (True, status.HTTP_200_OK),
+    "retrieve": (True, status.HTTP_200_OK),
+    "create": (False, status.HTTP_201_CREATED),
+    "update": (False, status.HTTP_200_OK),
+    "destroy": (False, status.HTTP_204_NO_CONTENT),
+}
+
+
+class Endpoint(NamedTuple):
+    """
+    List route of a viewset
+    """
+
+    path: str
+    viewset: type
+    basename: str
+
+    @property
+    def model(self):
+        """
+        Model of the queryset attribute of the viewset, or None (plain ViewSet, or get_queryset only)
+        """
+        queryset = getattr(self.viewset, "queryset", None)
+        return getattr(queryset, "model", None)
+
+
+def get_router_endpoints(router, base_path: str = "/") -> list:
+    """
+    Return the endpoints registered on router, included in the URLconf under base_path
+    """
+    return [
+        Endpoint(f"{base_path}{prefix}{router.trailing_slash}", viewset, basename)
+        for prefix, viewset, basename in router.registry
+    ]
+
+
+def get_urlconf_endpoints(urlconf=None) -> list:
+    """
+    Return the endpoints of the list routes of viewsets in urlconf (ROOT_URLCONF by default)
+    """
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            path = prefix + str(pattern.pattern).replace("^", "").replace("$", "")
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, path)
+            elif isinstance(pattern, URLPattern) and "list" in getattr(pattern.callback, "actions", {}).values():
+                # skip format suffix and other routes with parameters
+                if re.fullmatch(r"[\w/.-]*", path):
+                    basename = (pattern.name or "").rpartition("-list")[0]
+                    yield Endpoint(f"/{path}", pattern.callback.cls, basename)
+
+    return list(walk(get_resolver(urlconf).url_patterns, ""))
+
+
+def is_selected(endpoint: Endpoint, select: list = None) -> bool:
+    """
+    Return True if the basename or path of endpoint match one of the patterns in select,
+    or in the DRF_TESTER_ENDPOINTS environment variable (all endpoints if neither is set)
+    """
+    patterns = os.environ.get(ENDPOINTS_ENV)
+    patterns = patterns.split(",") if patterns else select
+    if not patterns:
+        return True
+    return any(fnmatch.fnmatch(endpoint.basename, p) or fnmatch.fnmatch(endpoint.path, p) for p in patterns)
+
+
+def infer_access_matrix(viewset, roles: tuple = ("anon", "auth", "admin", "staff")):
+    """
+    Return the AccessMatrix of viewset from its permission_classes, or None for custom permissions
+    - Denied anonymous requests: 401 if the first authentication class sends a WWW-Authenticate header, 403 otherwise
+    - Denied authenticated requests: 403
+    """
+    checks = []
+    for permission_class in viewset.permission_classes:
+        if permission_class not in PERMISSIONS:
+            return None
+        checks.append(PERMISSIONS[permission_class])
+    authentication_classes = viewset.authentication_classes
+    anon_denied = status.HTTP_403_FORBIDDEN
+    if authentication_classes and authentication_classes[0]().authenticate_header(None):
+        anon_denied = status.HTTP_401_UNAUTHORIZED
+    matrix = {}
+    for role in roles:
+        denied = anon_denied if role == "anon" else status.HTTP_403_FORBIDDEN
+        matrix[role] = {
+            action: expected_status if all(check(role, safe) for check in checks) else denied
+            for action, (safe, expected_status) in ACTIONS.items()
+        }
+    return AccessMatrix(**matrix)
+
+
+def get_factories(factories) -> dict:
+    """
+    Return {model: factory} of factories: a dict, or a module with factory-boy factories
+    """
+    if isinstance(factories, dict):
+        return factories
+    found = {}
+    for value in vars(factories).values():
+        if isinstance(value, type) and hasattr(value, "build_batch"):
+            found.setdefault(value._meta.model, value)
+    return found
+
+
+def get_test_name(endpoint: Endpoint) -> str:
+    """
+    Return the name of the test class of endpoint
+    """
+    name = "".join(part.capitalize() for part in re.split(r"\W+|_", endpoint.basename or endpoint.path) if part)
+    return f"{endpoint.viewset.__name__}{name}Test"
+
+
+def make_skipped_test(endpoint: Endpoint, reason: str, module: str):
+    """
+    Return a test class of endpoint, skipped for reason
+    """
+    test_class = type(
+        get_test_name(endpoint), (SimpleTestCase,), {"test_endpoint": lambda self: None, "__module__": module}
+    )
+    return unittest.skip(reason)(test_class)
+
+
+def make_test_class(endpoint: Endpoint, factory, access_matrix: AccessMatrix, module: str = __name__, **attributes):
+    """
+    Return the test class of endpoint, testing the cells of access_matrix with instances of factory
+    - attributes: class attributes of BaseDrfTest (user_data, admin_data, QUERY_BUDGET...)
+    """
+
+    def setUp(self):
+        """Instance data serialized from a factory instance, without read only fields"""
+        instance = self.factory.create()
+        instance.refresh_from_db()
+        serializer = self.viewset.serializer_class(instance, context={"request": self.requests.get(self.endpoint)})
+        self.instance_data = {
+            name: value for name, value in serializer.data.items() if not serializer.fields[name].read_only
+        }
+        instance.delete()
+
+    namespace = {
+        "ACCESS_MATRIX": access_matrix,
+        "REQUEST_FORMAT": "json",
+        "user_data": USER_DATA,
+        "admin_data": ADMIN_DATA,
+        "staff_data": STAFF_DATA,
+        **attributes,
+        "endpoint": endpoint.path,
+        "viewset": endpoint.viewset,
+        "model": endpoint.model,
+        "factory": factory,
+        "setUp": setUp,
+        "__module__": module,
+        "__doc__": f"{endpoint.viewset.__name__} at {endpoint.path}, discovered by drf_tester",
+    }
+    return type(get_test_name(endpoint), (APITestCase, BaseDrfTest), namespace)
+
+
+def get_load_tests(source=None, base_path: str = "/", *, module, factories=None, select: list = None, **attributes):
+    """
+    Return a load_tests function (unittest protocol) adding the test classes of the selected endpoints of source:
+    - source: a DRF router (included under base_path), or a URLconf (ROOT_URLCONF if None)
+    - module: the tests module defining load_tests, or its name (__name__), module of the test classes
+    - factories: {model: factory} or module of factory-boy factories
+    - select: patterns of basenames or paths of the endpoints to test (see is_selected)
+    - attributes: class attributes of every test class (see make_test_class)
+    Endpoints without queryset attribute or factory, or with custom permissions, get a skipped test.
+    """
+    module = getattr(module, "__name__", module)
+    test_classes = []
+
+    def get_test_classes() -> list:
+        """
+        Build the test classes once, as attributes of module (test processes of --parallel unpickle them from it)
+        """
+        if test_classes:
+            return test_classes
+        if hasattr(source, "registry"):
+            endpoints = get_router_endpoints(source, base_path)
+        else:
+            endpoints = get_urlconf_endpoints(source)
+        model_factories = get_factories(factories or {})
+        for endpoint in endpoints:
+            if not is_selected(endpoint, select):
+                continue
+            factory = model_factories.get(endpoint.model)
+            access_matrix = infer_access_matrix(endpoint.viewset)
+            if endpoint.model is None:
+                test_class = make_skipped_test(endpoint, "No queryset attribute, model can't be inferred", module)
+            elif factory is None:
+                test_class = make_skipped_test(endpoint, f"No factory for {endpoint.model.__name__}", module)
+            elif access_matrix is None:
+                test_class = make_skipped_test(endpoint, "Custom permissions, access can't be inferred", module)
+            else:
+                test_class = make_test_class(endpoint, factory, access_matrix, module, **attributes)
+            setattr(sys.modules[module], test_class.__name__, test_class)
+            test_classes.append(test_class)
+        return test_classes
+
+    def load_tests(loader, tests, pattern):
+        for test_class in get_test_classes():
+            tests.addTests(loader.loadTestsFromTestCase(test_class))
+        return tests
+
+    def module_getattr(name: str):
+        """
+        Build the test classes when one is looked up before load_tests runs (in test processes)
+        """
+        for test_class in get_test_classes():
+            if test_class.__name__ == name:
+                return test_class
+        raise AttributeError(f"module {module!r} has no attribute {name!r}")
+
+    if module in sys.modules:
+        vars(sys.modules[module]).setdefault("__getattr__", module_getattr)
+    return load_tests
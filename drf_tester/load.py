@@ -0,0 +1,173 @@
+"""
+Load testing: replay the allowed actions of a test class concurrently, against a live server
+
+class ThingViewSetLoadTest(LoadTestCase):
+    LOAD_TEST_CLASS = ThingViewSetTest
+    LOAD_REQUESTS = 200
+    LOAD_CONCURRENCY = 8
+
+Every action allowed to a role (by the ACCESS_MATRIX of LOAD_TEST_CLASS, or its Can* classes)
+is sent LOAD_REQUESTS times over HTTP, by LOAD_CONCURRENCY threads, to the endpoint of LOAD_TEST_CLASS.
+Reports throughput, p50/p95/p99 latency and error rate for each role and action
+(logged by the drf_tester logger at INFO level, and kept as self.load_report),
+and fails if an error rate is above MAX_ERROR_RATE.
+
+"""
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import LiveServerTestCase
+from rest_framework import status
+from rest_framework.test import force_authenticate
+
+from .matrix import get_access_matrix
+from .profiling import percentile
+from .utils import ROLES, User, create_instances, format_table, logger
+
+
+# Header with the pk of the user a request to the live server is authenticated as
+USER_HEADER = "X-Drf-Tester-User"
+# Key of USER_HEADER in the WSGI environ and request.META
+USER_META_KEY = f"HTTP_{USER_HEADER.upper().replace('-', '_')}"
+
+
+class ForceAuthenticationHandler(WSGIHandler):
+    """
+    WSGI handler of the live server, authenticating each request as the user in its USER_HEADER
+    (like force_authenticate does in tests, so load is measured without token or session costs)
+    Requests without USER_HEADER (anonymous requests, static and media files) go to the wrapped application.
+    """
+
+    def __init__(self, application):
+        super().__init__()
+        self.application = application
+        self.users = {}
+
+    def __call__(self, environ, start_response):
+        if USER_META_KEY not in environ:
+            return self.application(environ, start_response)
+        return super().__call__(environ, start_response)
+
+    def get_response(self, request):
+        pk = request.META.get(USER_META_KEY)
+        if pk:
+            if pk not in self.users:
+                self.users[pk] = User.objects.get(pk=pk)
+            force_authenticate(request, user=self.users[pk])
+        return super().get_response(request)
+
+
+class LoadTestCase(LiveServerTestCase):
+    """
+    Replay the allowed actions of LOAD_TEST_CLASS concurrently against a live server
+    """
+
+    # Test class (with endpoint, factory, instance_data, user_data... set in its setUp) to replay
+    LOAD_TEST_CLASS = None
+    # Requests sent for each role and action
+    LOAD_REQUESTS = 100
+    # Threads sending requests
+    LOAD_CONCURRENCY = 8
+    # Max share of requests of a role and action not answered with the expected status
+    MAX_ERROR_RATE = 0.0
+
+    static_handler = ForceAuthenticationHandler
+
+    def test_load(self):
+        """Allowed actions keep their error rate under MAX_ERROR_RATE under concurrent load"""
+        if self.LOAD_TEST_CLASS is None:
+            self.skipTest("LOAD_TEST_CLASS is not set")
+        source = self.LOAD_TEST_CLASS()
+        source.setUp()
+        users = {}
+        rows = [("role", "action", "requests", "req/s", "p50 ms", "p95 ms", "p99 ms", "error rate")]
+        failed = False
+        for role, action, expected_status in get_access_matrix(self.LOAD_TEST_CLASS):
+            if not status.is_success(expected_status):
+                continue
+            if role != "anon" and role not in users:
+                data_attribute, create = ROLES[role]
+                users[role] = create(getattr(source, data_attribute), source.FAST_PASSWORDS)
+            user = users.get(role)
+            requests = self.get_load_requests(source, action, user)
+            results, elapsed = self.replay(requests, user)
+            latencies = [latency / 1e6 for _, latency in results]
+            error_rate = sum(code != expected_status for code, _ in results) / len(results)
+            failed = failed or error_rate > self.MAX_ERROR_RATE
+            rows.append(
+                (
+                    role,
+                    action,
+                    len(results),
+                    f"{len(results) / (elapsed / 1e9):.1f}",
+                    f"{percentile(latencies, 50):.2f}",
+                    f"{percentile(latencies, 95):.2f}",
+                    f"{percentile(latencies, 99):.2f}",
+                    f"{error_rate:.2%}",
+                )
+            )
+        self.load_report = rows
+        logger.info("%s load:\n%s", self.id(), format_table(rows))
+        if failed:
+            self.fail(f"Error rate above {self.MAX_ERROR_RATE:.2%}:\n{format_table(rows)}")
+
+    def get_load_requests(self, source, action: str, user) -> list:
+        """
+        Return the (method, path, data) of the LOAD_REQUESTS requests of action,
+        creating the instances they need (owned by user for owned actions)
+        """
+        action, _, owned = action.partition("_")
+        amount = self.LOAD_REQUESTS if action == "destroy" else source.get_instance_amount()
+        instances = [] if action == "create" else create_instances(source.factory, amount, source.BULK_CREATE)
+        if owned:
+            source.set_owner(instances, user)
+        data = dict(source.instance_data)
+        if owned and action == "create":
+            data.update(source.get_owner_data(user))
+        page_path, _ = source.get_page_path(source.get_paginator(), 5, offset=10)
+        paths = {
+            "list": lambda i: ("get", source.endpoint, None),
+            "paginate": lambda i: ("get", page_path, None),
+            "create": lambda i: ("post", source.endpoint, data),
+            "retrieve": lambda i: ("get", f"{source.endpoint}{instances[i % amount].pk}/", None),
+            "update": lambda i: ("put", f"{source.endpoint}{instances[i % amount].pk}/", data),
+            "destroy": lambda i: ("delete", f"{source.endpoint}{instances[i].pk}/", None),
+        }
+        return [paths[action](i) for i in range(self.LOAD_REQUESTS)]
+
+    def replay(self, requests: list, user) -> tuple:
+        """
+        Send requests from LOAD_CONCURRENCY threads, and return [(status code, latency ns)] and elapsed ns
+        """
+        start = time.perf_counter_ns()
+        with ThreadPoolExecutor(self.LOAD_CONCURRENCY) as executor:
+            results = list(executor.map(lambda request: self.send(*request, user), requests))
+        return results, time.perf_counter_ns() - start
+
+    def send(self, method: str, path: str, data: dict, user) -> tuple:
+        """
+        Send request to the live server, and return its status code (None if the connection failed) and latency ns
+        """
+        body = json.dumps(data, cls=DjangoJSONEncoder).encode() if data is not None else None
+        request = urllib.request.Request(f"{self.live_server_url}{path}", data=body, method=method.upper())
+        if body is not None:
+            request.add_header("Content-Type", "application/json")
+        if user is not None:
+            request.add_header(USER_HEADER, str(user.pk))
+        start = time.perf_counter_ns()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                code = response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            error.close()
+            code = error.code
+        except urllib.error.URLError:
+            code = None
+        return code, time.perf_counter_ns() - start
@@ -0,0 +1,132 @@
+"""
+Declarative access matrix: expected status code of each action, for each role
+
+The test methods are generated on the test class by BaseDrfTest:
+
+class YourViewSetTest(APITestCase, BaseDrfTest):
+    ACCESS_MATRIX = AccessMatrix(
+        anon=no_access(),
+        auth=FULL_ACCESS,
+        admin=FULL_ACCESS,
+        staff=read_only(status.HTTP_403_FORBIDDEN),
+    )
+
+"""
+import re
+
+from rest_framework import status
+
+from .utils import ROLES
+
+
+MATRIX_ROLES = ("anon",) + tuple(ROLES)
+
+ACTIONS = (
+    "list",
+    "retrieve",
+    "create",
+    "update",
+    "destroy",
+    "paginate",
+    "list_owned",
+    "retrieve_owned",
+    "create_owned",
+    "update_owned",
+    "destroy_owned",
+)
+
+FULL_ACCESS = {
+    "list": status.HTTP_200_OK,
+    "retrieve": status.HTTP_200_OK,
+    "create": status.HTTP_201_CREATED,
+    "update": status.HTTP_200_OK,
+    "destroy": status.HTTP_204_NO_CONTENT,
+}
+
+OWNER_ACCESS = {
+    "list_owned": status.HTTP_200_OK,
+    "retrieve_owned": status.HTTP_200_OK,
+    "create_owned": status.HTTP_201_CREATED,
+    "update_owned": status.HTTP_200_OK,
+    "destroy_owned": status.HTTP_204_NO_CONTENT,
+}
+
+
+def no_access(status_code: int = status.HTTP_401_UNAUTHORIZED) -> dict:
+    """
+    Return actions of a role with no access to endpoint
+    """
+    return {action: status_code for action in FULL_ACCESS}
+
+
+def read_only(status_code: int = status.HTTP_401_UNAUTHORIZED) -> dict:
+    """
+    Return actions of a role with only read access to endpoint
+    """
+    return {
+        "list": status.HTTP_200_OK,
+        "retrieve": status.HTTP_200_OK,
+        "create": status_code,
+        "update": status_code,
+        "destroy": status_code,
+    }
+
+
+class AccessMatrix:
+    """
+    Expected status code of each action, for each role (anon, auth, admin, staff)
+    """
+
+    def __init__(self, **roles: dict):
+        for role, actions in roles.items():
+            if role not in MATRIX_ROLES:
+                raise ValueError(f"Unknown role '{role}', expected one of: {', '.join(MATRIX_ROLES)}")
+            for action in actions:
+                if action not in ACTIONS:
+                    raise ValueError(f"Unknown action '{action}', expected one of: {', '.join(ACTIONS)}")
+                if role == "anon" and action.endswith("_owned"):
+                    raise ValueError(f"Anonymous users can't own instances: '{action}'")
+        self.roles = roles
+
+    def __iter__(self):
+        """
+        Yield (role, action, expected status) for every cell of the matrix
+        """
+        for role, actions in self.roles.items():
+            for action, expected_status in actions.items():
+                yield role, action, expected_status
+
+    def by_action(self) -> dict:
+        """
+        Return {action: {role: expected status}}
+        """
+        actions = {}
+        for role, action, expected_status in self:
+            actions.setdefault(action, {})[role] = expected_status
+        return actions
+
+
+def get_access_matrix(test_class) -> AccessMatrix:
+    """
+    Return the AccessMatrix tested by test_class:
+    its ACCESS_MATRIX, and the single-action classes it inherits (e.g. drf_tester.viewsets.auth.CanList)
+    """
+    roles = {}
+    for klass in reversed(test_class.__mro__):
+        package, _, role = klass.__module__.rpartition(".")
+        match = re.fullmatch(r"(Can|No)(List|Retrieve|Create|Update|Destroy|Paginate)(Owned)?", klass.__name__)
+        if package != "drf_tester.viewsets" or match is None:
+            continue
+        allowed, action, owned = match.groups()
+        action = f"{action.lower()}_owned" if owned else action.lower()
+        if allowed == "Can":
+            expected_status = {**FULL_ACCESS, **OWNER_ACCESS, "paginate": status.HTTP_200_OK}[action]
+        elif role == "staff":
+            expected_status = status.HTTP_403_FORBIDDEN
+        else:
+            expected_status = status.HTTP_401_UNAUTHORIZED
+        roles.setdefault(role, {})[action] = expected_status
+    access_matrix = getattr(test_class, "ACCESS_MATRIX", None)
+    for role, action, expected_status in access_matrix or ():
+        roles.setdefault(role, {})[action] = expected_status
+    return AccessMatrix(**roles)
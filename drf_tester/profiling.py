@@ -0,0 +1,164 @@
+"""
+Collection of functions to measure the cost of requests made by tests in module
+
+"""
+import re
+import threading
+import time
+from collections import Counter
+
+from rest_framework.serializers import BaseSerializer
+
+
+# Timings of requests dispatched with timing enabled, for reports: [{"test", "role", "action", "view", ...}]
+TIMINGS = []
+
+# Original BaseSerializer.data property, patched while serializers are timed (see SerializerTimer)
+SERIALIZER_DATA = BaseSerializer.data
+
+
+def get_budget(budgets: dict, action: str, role: str):
+    """
+    Return the budget of role for action, or None
+    - budgets: {action: budget} or {action: {role: budget}}
+    - Owned actions ("list_owned") fall back to the budget of the action ("list")
+    """
+    if not budgets or action is None:
+        return None
+    budget = budgets.get(action)
+    if budget is None and action.endswith("_owned"):
+        budget = budgets.get(action[: -len("_owned")])
+    if isinstance(budget, dict):
+        budget = budget.get(role)
+    return budget
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Return sql statement with literal values replaced by ?, and lists of values by (...)
+    """
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", sql)
+    return " ".join(sql.split())
+
+
+def group_queries(captured_queries: list) -> list:
+    """
+    Return [(count, normalized statement)] of captured queries, most repeated first
+    """
+    counter = Counter(normalize_sql(query["sql"]) for query in captured_queries)
+    return [(count, sql) for sql, count in counter.most_common()]
+
+
+def percentile(values: list, percent: float):
+    """
+    Return the percentile of values (nearest rank)
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+class SerializerTimer:
+    """
+    Time spent in serializer .data by the current thread, inside the block
+
+    BaseSerializer.data is patched while any thread is timing (reference counted, under a lock),
+    and only serializers of timing threads are timed: other threads, like the server threads of
+    LoadTestCase, serialize as usual, and the original property is restored by the last thread.
+    """
+
+    lock = threading.Lock()
+    timing_threads = 0
+    current = threading.local()
+
+    def __init__(self):
+        self.ns = 0
+
+    def __enter__(self):
+        with self.lock:
+            if SerializerTimer.timing_threads == 0:
+                BaseSerializer.data = property(timed_data)
+            SerializerTimer.timing_threads += 1
+        self.outer = getattr(self.current, "timer", None)
+        self.current.timer = self
+        return self
+
+    def __exit__(self, *exc_info):
+        self.current.timer = self.outer
+        with self.lock:
+            SerializerTimer.timing_threads -= 1
+            if SerializerTimer.timing_threads == 0:
+                BaseSerializer.data = SERIALIZER_DATA
+
+
+def timed_data(serializer):
+    """
+    BaseSerializer.data, adding its time to the SerializerTimer of the current thread if any
+    """
+    timer = getattr(SerializerTimer.current, "timer", None)
+    if timer is None:
+        return SERIALIZER_DATA.fget(serializer)
+    start = time.perf_counter_ns()
+    try:
+        return SERIALIZER_DATA.fget(serializer)
+    finally:
+        timer.ns += time.perf_counter_ns() - start
+
+
+def timed_dispatch(view, request, **kwargs) -> tuple:
+    """
+    Return the response of view to request, and the time in ns of each phase:
+    - view: whole call to the view
+    - serializer: time spent in serializer .data, part of the view phase (see SerializerTimer)
+    - render: rendering of the response
+    """
+    timing = {"view": 0, "serializer": 0, "render": 0}
+    with SerializerTimer() as serializer_timer:
+        start = time.perf_counter_ns()
+        response = view(request, **kwargs)
+        timing["view"] = time.perf_counter_ns() - start
+    timing["serializer"] = serializer_timer.ns
+    if hasattr(response, "render"):
+        start = time.perf_counter_ns()
+        response.render()
+        timing["render"] = time.perf_counter_ns() - start
+    return response, timing
+
+
+def format_timing(timing: dict) -> str:
+    """
+    Return phases of timing in ms, as text
+    """
+    return ", ".join(f"{phase} {ns / 1e6:.2f} ms" for phase, ns in timing.items())
+
+
+def get_full_scans(connection, sql: str) -> list:
+    """
+    Return the tables fully scanned by the plan of sql, a filtered select statement:
+    - SQLite: SCAN steps of EXPLAIN QUERY PLAN, not using an index
+    - PostgreSQL: Seq Scan nodes of EXPLAIN, planned with enable_seqscan off so any usable index is preferred
+    Unfiltered statements (lists of a whole table) and other databases return no scans
+    """
+    if not re.match(r"\s*SELECT\b", sql, re.IGNORECASE) or not re.search(r"\bWHERE\b", sql, re.IGNORECASE):
+        return []
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = [row[-1] for row in cursor.fetchall()]
+            pattern = r"SCAN (?:TABLE )?(\w+)(?: AS \w+)?$"
+        elif connection.vendor == "postgresql":
+            cursor.execute("SET enable_seqscan = off")
+            try:
+                cursor.execute(f"EXPLAIN {sql}")
+                plan = [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.execute("RESET enable_seqscan")
+            pattern = r"Seq Scan on (\w+)"
+        else:
+            return []
+    # SQLite names aliased tables (subqueries) by their alias
+    aliases = dict((alias, table) for table, alias in re.findall(r'"(\w+)"\s+(?:AS\s+)?"?(\w+)"?', sql))
+    scans = (re.search(pattern, line.strip()) for line in plan)
+    return sorted({aliases.get(match.group(1), match.group(1)) for match in scans if match})
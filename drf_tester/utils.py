@@ -2,48 +2,316 @@
 Collection of functions to be used by other tests in module
 
 """
+import copy
+import datetime
+import decimal
+import functools
+import json
+import logging
+import os
 import random
+import time
+import tracemalloc
+import unittest
+import uuid
+import warnings
+import zlib
+from contextlib import contextmanager, nullcontext
+from statistics import median
+from urllib.parse import urlencode
 
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIRequestFactory
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, router, transaction
+from django.db.models import signals
+from django.db.models.constants import LOOKUP_SEP
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination, PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .profiling import (
+    TIMINGS,
+    format_timing,
+    get_budget,
+    get_full_scans,
+    group_queries,
+    normalize_sql,
+    timed_dispatch,
+)
+
+
+try:
+    from factory.random import reseed_random
+except ImportError:  # factory-boy not installed: only instance amounts are seeded
+    reseed_random = None
 
 
 User = get_user_model()
 
+logger = logging.getLogger("drf_tester")
+
+# Environment variable overriding BaseDrfTest.SEED
+SEED_ENV = "DRF_TESTER_SEED"
+
+# Random generator of instance amounts, seeded for each test (and class) by seed_random
+randgen = random.Random()
+
+
+def get_seed(*names: str) -> int:
+    """
+    Return a seed derived from names, the same in every process (unlike hash())
+    """
+    return zlib.crc32(":".join(names).encode())
+
+
+def seed_random(seed: int):
+    """
+    Seed the random instance amounts, and factory-boy's fuzzy attributes and Faker
+    """
+    randgen.seed(seed)
+    if reseed_random is not None:
+        reseed_random(seed)
+
 
-def create_user(instance_data: dict) -> User:
+def create_user(instance_data: dict, fast_password: bool = True) -> User:
     """
     Create and return an instance of the user model
+    - Unusable password if fast_password (no hashing cost, enough for force_authenticate)
+    - Password hashed with the project's hasher otherwise
     """
-    return User.objects.create(**instance_data)
+    password = None if fast_password else instance_data.get("password")
+    return User.objects.create(**{**instance_data, "password": make_password(password)})
 
 
-def get_active_user(instance_data: dict) -> User:
+def get_active_user(instance_data: dict, fast_password: bool = True) -> User:
     """
     Return an active instance of user
     """
-    instance_data["is_active"] = True
-    return create_user(instance_data)
+    return create_user({**instance_data, "is_active": True}, fast_password)
 
 
-def get_active_admin(instance_data: dict) -> User:
+def get_active_admin(instance_data: dict, fast_password: bool = True) -> User:
     """
     Return an active instance of admin user
     """
-    instance_data["is_active"] = True
-    instance_data["is_superuser"] = True
-
-    return create_user(instance_data)
+    return create_user({**instance_data, "is_active": True, "is_superuser": True}, fast_password)
 
 
-def get_active_staff(instance_data: dict) -> User:
+def get_active_staff(instance_data: dict, fast_password: bool = True) -> User:
     """
     Return an active instance of admin user
     """
-    instance_data["is_active"] = True
-    instance_data["is_staff"] = True
+    return create_user({**instance_data, "is_active": True, "is_staff": True}, fast_password)
+
+
+def get_bulk_create_blocker(model) -> str:
+    """
+    Return the reason why instances of model can't be saved with bulk_create, or None if they can:
+    - database must return primary keys from bulk inserts
+    - no multi-table inheritance
+    - no pre_save/post_save receivers (bulk_create does not send signals)
+    """
+    database = connections[router.db_for_write(model)]
+    features = database.features
+    returns_pks = getattr(features, "can_return_rows_from_bulk_insert", False) or getattr(
+        features, "can_return_ids_from_bulk_insert", False
+    )
+    if not returns_pks:
+        return f"{database.vendor} database does not return primary keys from bulk inserts"
+    if model._meta.parents:
+        return "multi-table inheritance"
+    for signal in ("pre_save", "post_save"):
+        if getattr(signals, signal).has_listeners(model):
+            return f"{signal} receivers"
+    return None
+
 
-    return create_user(instance_data)
+def bulk_save(instances: list) -> list:
+    """
+    Save a list of unsaved instances of the same model, and their unsaved FK dependencies:
+    - one bulk_create per model when possible
+    - per-row save() for models that can't be bulk created, with a RuntimeWarning
+    """
+    if not instances:
+        return instances
+    # Collect unsaved related objects, grouped by model
+    dependencies = {}
+    for instance in instances:
+        for field in instance._meta.concrete_fields:
+            if field.many_to_one or field.one_to_one:
+                related = field.get_cached_value(instance, default=None)
+                if related is not None and related._state.adding:
+                    dependencies.setdefault(type(related), {})[id(related)] = related
+    for related_instances in dependencies.values():
+        bulk_save(list(related_instances.values()))
+    # Link instances with the saved dependencies
+    for instance in instances:
+        for field in instance._meta.concrete_fields:
+            if field.many_to_one or field.one_to_one:
+                related = field.get_cached_value(instance, default=None)
+                if related is not None:
+                    setattr(instance, field.attname, related.pk)
+
+    model = type(instances[0])
+    blocker = get_bulk_create_blocker(model)
+    if blocker is None:
+        model._default_manager.bulk_create(instances)
+    else:
+        warnings.warn(
+            f"{model.__name__} instances can't be bulk created ({blocker}), saved one by one", RuntimeWarning
+        )
+        for instance in instances:
+            instance.save()
+    return instances
+
+
+def create_instances(factory, amount: int, bulk: bool = False) -> list:
+    """
+    Create and return a list of instances using factory
+    - Saved with bulk_create if bulk is True
+    """
+    if bulk:
+        return bulk_save(factory.build_batch(amount))
+    return [factory() for i in range(amount)]
+
+
+def assign_owner(instances: list, path: str, user: User):
+    """
+    Make user the owner of saved instances through path:
+    - field of the instances ("creator"): one UPDATE, also set on the instances in memory
+    - field of related instances ("project__owner"): one UPDATE of the related rows, selected with a subquery
+    - many-to-many field ("members"): user added with one bulk insert in the through table
+    - many-to-many field of related instances ("project__members"): one SELECT of the related rows,
+    and one bulk insert
+    """
+    model = type(instances[0])
+    pks = [instance.pk for instance in instances]
+    *relations, field_name = path.split(LOOKUP_SEP)
+    if relations:
+        relation_path = LOOKUP_SEP.join(relations)
+        related = model._base_manager.filter(pk__in=pks, **{f"{relation_path}__isnull": False})
+        # not evaluated: used as subquery of the UPDATE
+        pks = related.values_list(f"{relation_path}__pk", flat=True)
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+    field = model._meta.get_field(field_name)
+    if field.many_to_many:
+        through = field.remote_field.through
+        source, target = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+        rows = [through(**{source: pk, target: user.pk}) for pk in set(pks)]
+        through._base_manager.bulk_create(rows, ignore_conflicts=True)
+        return
+    model._base_manager.filter(pk__in=pks).update(**{field_name: user})
+    if not relations:
+        for instance in instances:
+            setattr(instance, field_name, user)
+
+
+# role -> (name of the test attribute holding the user data, user creation function)
+ROLES = {
+    "auth": ("user_data", get_active_user),
+    "admin": ("admin_data", get_active_admin),
+    "staff": ("staff_data", get_active_staff),
+}
+
+# Request bodies kept by each test class (see BaseDrfTest.get_request_body)
+MAX_REQUEST_BODIES = 64
+# Actions whose queries are explained if EXPLAIN_SCAN_ROWS is set
+EXPLAINED_ACTIONS = ("list", "retrieve", "list_owned", "retrieve_owned")
+# Actions whose response payload is measured if TIMING, MAX_LIST_BYTES or MAX_ITEM_BYTES is set
+PAYLOAD_ACTIONS = ("list", "list_owned")
+
+
+def format_table(rows: list) -> str:
+    """
+    Return rows (first one is the header) as text table, with aligned columns
+    """
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows)
+
+
+def action_name(action: str, owned: bool) -> str:
+    """
+    Return name of action as used in ACCESS_MATRIX and budgets ("list" or "list_owned")
+    """
+    return f"{action}_owned" if owned else action
+
+
+@functools.lru_cache(maxsize=None)
+def get_viewset_view(viewset, actions: tuple):
+    """
+    Return the view function of viewset for actions ((method, action) pairs), built once per viewset and actions
+    Methods whose action is not implemented by the viewset are left out
+    """
+    return viewset.as_view({method: action for method, action in actions if hasattr(viewset, action)})
+
+
+def get_data_key(data):
+    """
+    Return a canonical JSON dump of request data, or None if it has values without a stable text form
+    Decimals, dates, times and UUIDs are dumped with their type, so they never share a key with strings
+    """
+
+    def default(value):
+        if isinstance(value, (datetime.date, datetime.time)):
+            return {type(value).__name__: value.isoformat()}
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return {type(value).__name__: str(value)}
+        raise TypeError(f"{type(value).__name__} has no stable text form")
+
+    try:
+        return json.dumps(data, sort_keys=True, default=default)
+    except (TypeError, ValueError):
+        return None
+
+
+def log_seed(test):
+    """
+    Return test method logging the seed of its random data if it fails
+    """
+
+    @functools.wraps(test)
+    def logged(self, *args, **kwargs):
+        try:
+            return test(self, *args, **kwargs)
+        except unittest.SkipTest:
+            raise
+        except Exception:
+            seed = self.get_base_seed()
+            logger.error("%s failed with seed %s, rerun with %s=%s", self.id(), seed, SEED_ENV, seed)
+            raise
+
+    logged.logs_seed = True
+    return logged
+
+
+def make_access_test(role: str, action: str, expected_status: int):
+    """
+    Return a test method checking that role gets expected_status on action
+    """
+
+    def test(self):
+        self.check_access(role, action, expected_status)
+
+    test.__name__ = f"test_{role}_user_{action}_{expected_status}"
+    test.__doc__ = f"{role.capitalize()} user {action.replace('_', ' ')}: status {expected_status}"
+    return test
+
+
+def make_probe_test(action: str, expected: dict):
+    """
+    Return a test method checking that each role gets its expected status on action
+    """
+
+    def test(self):
+        self.check_roles(action, expected)
+
+    test.__name__ = f"test_{action}_access"
+    test.__doc__ = f"{action.capitalize().replace('_', ' ')} access: " + ", ".join(
+        f"{role} {expected_status}" for role, expected_status in expected.items()
+    )
+    return test
 
 
 class BaseDrfTest:
@@ -51,39 +319,845 @@ class BaseDrfTest:
     All Test classes must extend BaseDrfTest
 
     - setUp() must be overridden
+    - User data declared as class attributes creates users once per class
+    - SHARED_FIXTURES requires factory and user data as class attributes
     """
 
     # Customize for desired range of random instances
     MIN = 5
     MAX = 10
+    # seed of random data (instance amounts, factory fuzz), overridden by the DRF_TESTER_SEED environment variable
+    SEED = 0
     # set to integer value if random instance amounts are not desired
     EXACT_AMOUNT = None
+    # set to True to build instances in memory and save them with bulk_create
+    BULK_CREATE = False
+    # set to True to create users and instances once per class, in setUpTestData
+    SHARED_FIXTURES = False
+    # set to False to hash the passwords of created users (required to log in with password)
+    FAST_PASSWORDS = True
+    # set to a drf_tester.matrix.AccessMatrix to generate the access tests of the class
+    ACCESS_MATRIX = None
+    # set to True to generate one test per action of ACCESS_MATRIX, probing all its roles
+    COMBINED_PROBE = False
+    # max queries per request: {action: amount} or {action: {role: amount}}
+    QUERY_BUDGET = None
+    # set to instance amounts (e.g. (5, 50)) to check that list queries don't grow with them
+    N_PLUS_ONE_AMOUNTS = None
+    # set to True to time the view, serializer and render phases of each request
+    TIMING = False
+    # max ms per request (view and render), enables TIMING: {action: ms} or {action: {role: ms}}
+    LATENCY_BUDGET_MS = None
+    # set to an instance amount (e.g. 5000) to walk every page of a list that large in paginate checks
+    PAGINATION_WALK_AMOUNT = None
+    # page size of the pagination walk
+    PAGINATION_WALK_PAGE_SIZE = 100
+    # set to an instance amount (e.g. 2000) to check owned lists among instances of another user
+    FOREIGN_MIX_AMOUNT = None
+    # share of the instances of FOREIGN_MIX_AMOUNT owned by another user
+    FOREIGN_RATIO = 0.9
+    # set to a max ratio (e.g. 2.0) of the latency of the last pages to the first pages, in cursor pagination walks
+    CURSOR_LATENCY_RATIO = None
+    # set to a row count to fail on filtered list/retrieve queries fully scanning a table with more rows (0 for any)
+    EXPLAIN_SCAN_ROWS = None
+    # max bytes of the rendered body of list responses, and max bytes per listed instance (enable TIMING for lists)
+    MAX_LIST_BYTES = None
+    MAX_ITEM_BYTES = None
+    # set to an instance amount (e.g. 10000) to measure the peak memory of a list request that large (tracemalloc)
+    MEMORY_PROFILE_AMOUNT = None
+    # max peak memory in bytes of the list request of MEMORY_PROFILE_AMOUNT (e.g. 64 * 2**20)
+    MEMORY_BUDGET = None
+    # methods of the list and detail routes of self.viewset, like DRF routers
+    LIST_ACTIONS = {"get": "list", "post": "create"}
+    DETAIL_ACTIONS = {"get": "retrieve", "put": "update", "patch": "partial_update", "delete": "destroy"}
+    # format of the body of post/put requests: "json", "multipart" or "form" (None for TEST_REQUEST_DEFAULT_FORMAT)
+    REQUEST_FORMAT = None
     requests = APIRequestFactory()
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        - Generate the test methods declared in ACCESS_MATRIX (one per action if COMBINED_PROBE)
+        - Hook shared fixtures into the setUpTestData of django's TestCase
+        (which comes before BaseDrfTest in the MRO of the final test classes)
+        - Seed random data before the setUp of each test, and log the seed of failed tests
+        """
+        super().__init_subclass__(**kwargs)
+        access_matrix = cls.__dict__.get("ACCESS_MATRIX")
+        if access_matrix is not None and cls.COMBINED_PROBE:
+            for action, expected in access_matrix.by_action().items():
+                test = make_probe_test(action, expected)
+                setattr(cls, test.__name__, test)
+        elif access_matrix is not None:
+            for role, action, expected_status in access_matrix:
+                test = make_access_test(role, action, expected_status)
+                setattr(cls, test.__name__, test)
+
+        set_up = cls.__dict__.get("setUp")
+        if set_up is not None and not getattr(set_up, "seeds_random", False):
+
+            def setUp(self):
+                self.seed_random()
+                set_up(self)
+
+            setUp.seeds_random = True
+            setUp.__doc__ = set_up.__doc__
+            cls.setUp = setUp
+
+        for name, test in list(cls.__dict__.items()):
+            if name.startswith("test") and callable(test) and not getattr(test, "logs_seed", False):
+                setattr(cls, name, log_seed(test))
+
+        set_up_test_data = getattr(cls, "setUpTestData", None)
+        if set_up_test_data is None or getattr(set_up_test_data, "sets_up_shared_fixtures", False):
+            return
+
+        def setUpTestData(klass):
+            set_up_test_data.__func__(klass)
+            klass.set_up_shared_fixtures()
+
+        setUpTestData.sets_up_shared_fixtures = True
+        cls.setUpTestData = classmethod(setUpTestData)
+
+    @classmethod
+    def set_up_shared_fixtures(cls):
+        """
+        Create users and model instances shared by all tests in class
+        - Users for every role with data declared as class attribute
+        - Instance pool of the size returned by get_instance_amount(), if SHARED_FIXTURES
+        Isolation between tests relies on TestCase transaction rollback.
+        """
+        # TestCase.setUpClass creates new cls_atomics on every run of the class
+        run = getattr(cls, "cls_atomics", None)
+        if run is not None and cls.__dict__.get("shared_fixtures_run") is run:
+            return
+        cls.shared_fixtures_run = run
+        seed_random(get_seed(str(cls.get_base_seed()), cls.__module__, cls.__qualname__))
+        cls.shared_users = {}
+        for role, (attribute, get_user) in ROLES.items():
+            data = getattr(cls, attribute, None)
+            if data is not None:
+                cls.shared_users[role, get_data_key(data)] = get_user(data, cls.FAST_PASSWORDS)
+        if not cls.SHARED_FIXTURES:
+            return
+        cls.shared_instances = create_instances(cls.factory, cls.get_instance_amount(), cls.BULK_CREATE)
+
+    @classmethod
+    def get_base_seed(cls) -> int:
+        """
+        Return the seed of random data: DRF_TESTER_SEED environment variable if set, SEED otherwise
+        """
+        return int(os.environ.get(SEED_ENV, cls.SEED))
+
+    def seed_random(self):
+        """
+        Seed random data (instance amounts, factory fuzz) from the base seed and the test id,
+        so each test creates the same data on every run, whichever worker runs it
+        """
+        seed_random(get_seed(str(self.get_base_seed()), self.id()))
+
+    def get_shared_fixture(self, name: str):
+        """
+        Return shared fixture if created for this test class, or None
+        """
+        if name in type(self).__dict__:
+            return getattr(self, name)
+        return None
+
+    def get_instance_pool(self):
+        """
+        Return instances prepared for this test (check_roles) or class (SHARED_FIXTURES), or None
+        """
+        instance_pool = self.__dict__.get("instance_pool")
+        if instance_pool is None:
+            instance_pool = self.get_shared_fixture("shared_instances")
+        return instance_pool
+
     def check_equal_data(self, original: dict, received: dict):
         for key, value in original.items():
             self.assertEqual(value, received[key])
         return
 
+    def get_role_user(self, role: str, data: dict) -> User:
+        """
+        Return the user for role and data, created only once:
+        - Per class, if the role data is declared as class attribute
+        - Per test (transaction) otherwise, from data
+        Other data for the same role is another user. Data without a canonical JSON dump (see get_data_key)
+        creates a user on every call. The data dict is never modified.
+        """
+        key = (role, get_data_key(data))
+        shared_users = self.get_shared_fixture("shared_users") or {}
+        if key in shared_users:
+            return shared_users[key]
+        if key[1] is None:
+            return ROLES[role][1](data, self.FAST_PASSWORDS)
+        user_cache = self.__dict__.setdefault("user_cache", {})
+        if key not in user_cache:
+            user_cache[key] = ROLES[role][1](data, self.FAST_PASSWORDS)
+        return user_cache[key]
+
     def get_admin_user(self, data: dict) -> User:
-        return get_active_admin(data)
+        return self.get_role_user("admin", data)
 
     def get_active_user(self, data: dict) -> User:
-        return get_active_user(data)
+        return self.get_role_user("auth", data)
 
     def get_active_staff(self, data: dict) -> User:
-        return get_active_staff(data)
+        return self.get_role_user("staff", data)
 
-    def get_model_instances(self) -> list:
+    @classmethod
+    def get_instance_amount(cls) -> int:
+        """
+        Return amount of instances to create:
+        - EXACT_AMOUNT if not null
+        - Random number between MIN and MAX (customizable)
+        """
+        if cls.EXACT_AMOUNT:
+            return cls.EXACT_AMOUNT
+        return randgen.randint(cls.MIN, cls.MAX)
+
+    def get_model_instances(self, mutates: bool = False) -> list:
         """
         Return list of model instances:
+        - The instance pool if available (copies if the test mutates them)
         - Exact size if self.EXACT_AMOUNT is not null
         - Random size between MIN and MAX (customizable)
+        - Saved with bulk_create if self.BULK_CREATE is True
+        """
+        instance_pool = self.get_instance_pool()
+        if instance_pool is not None:
+            return copy.deepcopy(instance_pool) if mutates else list(instance_pool)
+        return create_instances(self.factory, self.get_instance_amount(), self.BULK_CREATE)
+
+    def get_model_instance(self, mutates: bool = False):
+        """
+        Return a single model instance:
+        - From the instance pool if available (a copy if the test mutates it)
+        - Newly created with self.factory otherwise
+        """
+        instance_pool = self.get_instance_pool()
+        if instance_pool:
+            return copy.deepcopy(instance_pool[0]) if mutates else instance_pool[0]
+        return create_instances(self.factory, 1, self.BULK_CREATE)[0]
+
+    def get_request_user(self, role: str):
+        """
+        Return the user making requests for role (None for anonymous users)
+        """
+        if role == "anon":
+            return None
+        return self.get_role_user(role, getattr(self, ROLES[role][0]))
+
+    def get_request_body(self, data: dict) -> tuple:
+        """
+        Return (body, content type) of data encoded in REQUEST_FORMAT, encoded only once per test class,
+        format and data
+        - json, multipart: with the renderers of the request factory (TEST_REQUEST_RENDERER_CLASSES)
+        - form: url encoded
+        The class keeps the last MAX_REQUEST_BODIES bodies. Data without a canonical JSON dump (see get_data_key)
+        is encoded on every request.
+        """
+        request_format = self.REQUEST_FORMAT or self.requests.default_format
+        key = (request_format, get_data_key(data))
+        request_bodies = type(self).__dict__.get("request_bodies")
+        if request_bodies is None:
+            request_bodies = type(self).request_bodies = {}
+        if key in request_bodies:
+            return request_bodies[key]
+        if request_format == "form":
+            body, content_type = urlencode(data, doseq=True).encode(), "application/x-www-form-urlencoded"
+        else:
+            renderer = self.requests.renderer_classes[request_format]()
+            body, content_type = renderer.render(data), renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            if isinstance(body, str):
+                body = body.encode(renderer.charset)
+        if key[1] is not None:
+            if len(request_bodies) >= MAX_REQUEST_BODIES:
+                # oldest body first
+                del request_bodies[next(iter(request_bodies))]
+            request_bodies[key] = (body, content_type)
+        return body, content_type
+
+    def build_request(self, user, method: str, path: str = None, data: dict = None):
+        """
+        Return request for endpoint (or path), authenticated as user if not None
+        The data of post/put/patch requests is sent as a body encoded once per test class (see get_request_body)
+        """
+        if method in ("post", "put", "patch") and data is not None:
+            body, content_type = self.get_request_body(data)
+            request = getattr(self.requests, method)(path or self.endpoint, data=body, content_type=content_type)
+        else:
+            request = getattr(self.requests, method)(path or self.endpoint, data=data)
+        if user is not None:
+            force_authenticate(request, user=user)
+        return request
+
+    def get_view(self, detail: bool = False):
+        """
+        Return the view function of the list route, or of the detail route (requests with pk) if detail:
+        - self.viewset: as_view with LIST_ACTIONS or DETAIL_ACTIONS, built once per viewset
+        - self.view: used as is, except detail requests to a viewset view, which go to the DETAIL_ACTIONS
+        of its viewset (a single action map would send get with pk to list)
+        """
+        viewset = getattr(self, "viewset", None)
+        if viewset is None:
+            if not detail or not hasattr(self.view, "actions"):
+                return self.view
+            viewset = self.view.cls
+        actions = self.DETAIL_ACTIONS if detail else self.LIST_ACTIONS
+        return get_viewset_view(viewset, tuple(actions.items()))
+
+    def dispatch(self, request, action: str = None, role: str = None, **kwargs):
+        """
+        Return the response of the view to request (also kept as self.last_response)
+        - Timing of the request kept as self.last_timing (None if not timed)
+        - Sent to the detail route if kwargs has pk (see get_view)
+        - Fail if the queries run by the view exceed the QUERY_BUDGET of action and role
+        - Record the timing of the request if TIMING (see record_timing)
+        - Fail if the request takes longer than the LATENCY_BUDGET_MS of action and role
+        - Fail if list and retrieve queries fully scan large tables, if EXPLAIN_SCAN_ROWS (see check_query_plans)
+        """
+        query_budget = get_budget(self.QUERY_BUDGET, action, role)
+        latency_budget = get_budget(self.LATENCY_BUDGET_MS, action, role)
+        timed = self.TIMING or latency_budget is not None or (action in PAYLOAD_ACTIONS and self.has_payload_budget())
+        explained = self.EXPLAIN_SCAN_ROWS is not None and action in EXPLAINED_ACTIONS
+        view = self.get_view(detail="pk" in kwargs)
+        queries = CaptureQueriesContext(connection) if query_budget is not None or explained else nullcontext()
+        timing = None
+        with queries:
+            if timed:
+                self.last_response, timing = timed_dispatch(view, request, **kwargs)
+                self.record_timing(action, role, timing)
+            else:
+                self.last_response = view(request, **kwargs)
+        self.last_timing = timing
+
+        if query_budget is not None and len(queries) > query_budget:
+            rows = [("count", "statement")] + group_queries(queries.captured_queries)
+            self.fail(
+                f"{role.capitalize()} user {action} ran {len(queries)} queries, budget is {query_budget}:\n"
+                f"{format_table(rows)}"
+            )
+        if latency_budget is not None:
+            elapsed_ms = (timing["view"] + timing["render"]) / 1e6
+            if elapsed_ms > latency_budget:
+                self.fail(
+                    f"{role.capitalize()} user {action} took {elapsed_ms:.2f} ms, budget is {latency_budget} ms "
+                    f"({format_timing(timing)})"
+                )
+        if explained:
+            self.check_query_plans(queries.captured_queries, action, role)
+        return self.last_response
+
+    def check_query_plans(self, captured_queries: list, action: str, role: str):
+        """
+        Fail if filtered select statements in captured_queries fully scan a table of more than EXPLAIN_SCAN_ROWS rows
+        (missing index on an owner foreign key or a filtered field), on SQLite and PostgreSQL (see get_full_scans)
+        """
+        scans = [("table", "rows", "statement")]
+        rows = {}
+        tables = set(connection.introspection.table_names())
+        for query in captured_queries:
+            for table in get_full_scans(connection, query["sql"]):
+                if table not in tables:
+                    continue
+                if table not in rows:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+                        rows[table] = cursor.fetchone()[0]
+                if rows[table] > self.EXPLAIN_SCAN_ROWS:
+                    scans.append((table, rows[table], normalize_sql(query["sql"])))
+        if len(scans) > 1:
+            self.fail(f"{role.capitalize()} user {action} queries fully scan tables:\n{format_table(scans)}")
+
+    def record_timing(self, action: str, role: str, timing: dict):
+        """
+        Keep timing of request in self.timings, and in drf_tester.profiling.TIMINGS for reports
+        """
+        record = {"test": self.id(), "role": role, "action": action, **timing}
+        self.__dict__.setdefault("timings", []).append(record)
+        TIMINGS.append(record)
+
+    def get_owner_paths(self) -> list:
+        """
+        Return the paths from instances to their owner: USER_FIELD_NAME, a path or a list of paths
+        """
+        if isinstance(self.USER_FIELD_NAME, str):
+            return [self.USER_FIELD_NAME]
+        return list(self.USER_FIELD_NAME)
+
+    def get_owner_data(self, user: User) -> dict:
+        """
+        Return the data making user the owner of a created instance (fields of the model itself only)
+        """
+        data = {}
+        for path in self.get_owner_paths():
+            if LOOKUP_SEP not in path:
+                data[path] = [user.pk] if self.model._meta.get_field(path).many_to_many else user.pk
+        return data
+
+    def set_owner(self, instances: list, user: User):
+        """
+        Make user the owner of instances, through every path of USER_FIELD_NAME (see assign_owner)
+        One query per path (two for many-to-many fields of related instances), instead of saving every instance
+        """
+        if not instances:
+            return
+        for path in self.get_owner_paths():
+            assign_owner(instances, path, user)
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Run block inside a savepoint, always rolled back on exit
+
+        Lets many mutating checks (update, destroy, ownership) run in sequence
+        on the same instances, without creating them again.
+        Users must be created before entering the savepoint, as they are cached.
+        """
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+    def check_access(self, role: str, action: str, expected_status: int):
+        """
+        Run the check of action ("list", "update_owned", ...) for role
+        """
+        action, _, owned = action.partition("_")
+        getattr(self, f"check_{action}")(role, expected_status, owned=bool(owned))
+
+    def check_roles(self, action: str, expected: dict):
+        """
+        Run action for each role (role -> expected status) against one set of instances
+        - Each role's check runs inside a savepoint, rolled back afterwards (see savepoint)
+        - Failures are reported together, in one table
+        """
+        for role in expected:
+            self.get_request_user(role)
+        if not action.startswith("create"):
+            self.instance_pool = self.get_model_instances()
+        rows = [("role", "expected", "received", "error")]
+        failed = False
+        for role, expected_status in expected.items():
+            self.last_response = None
+            error = ""
+            try:
+                self.check_access(role, action, expected_status)
+            except AssertionError as e:
+                error = str(e).splitlines()[0]
+                failed = True
+            received = self.last_response.status_code if self.last_response is not None else "-"
+            rows.append((role, expected_status, received, error))
+        if failed:
+            self.fail(f"Unexpected access to {action}:\n{format_table(rows)}")
+
+    def get_response_pks(self, items: list):
+        """
+        Return the set of primary keys of serialized instances in items, or None if not serialized
         """
-        if self.EXACT_AMOUNT:
-            return [self.factory() for i in range(self.EXACT_AMOUNT)]
+        pk_name = self.model._meta.pk.name
+        if not all(isinstance(item, dict) and pk_name in item for item in items):
+            return None
+        return {item[pk_name] for item in items}
+
+    def check_list(self, role: str, expected_status: int, owned: bool = False):
+        """
+        Request list of instances, and assert the instances created by the test are returned on success
+        (other rows in the table, from migrations or other fixtures, are not counted)
+        """
+        user = self.get_request_user(role)
+        with self.savepoint():
+            instances = self.get_model_instances(mutates=owned)
+            if owned:
+                self.set_owner(instances, user)
+            request = self.build_request(user, "get")
+            response = self.dispatch(request, action_name("list", owned), role)
+            timing = self.last_timing
+            self.assertEqual(response.status_code, expected_status)
+            if status.is_success(expected_status):
+                items = response.data
+                if isinstance(items, dict) and "results" in items:
+                    # paginated list: the instances of the test fit in its first page
+                    items = items["results"]
+                received = self.get_response_pks(items)
+                if received is None:
+                    self.assertGreaterEqual(len(items), len(instances))
+                else:
+                    self.assertLessEqual({instance.pk for instance in instances}, received)
+                if self.TIMING or self.has_payload_budget():
+                    self.check_payload(response, len(items), action_name("list", owned), role, timing)
+        if status.is_success(expected_status) and self.N_PLUS_ONE_AMOUNTS:
+            self.check_query_scaling(role, owned=owned)
+        if status.is_success(expected_status) and owned and self.FOREIGN_MIX_AMOUNT:
+            self.check_owned_filtering(role)
+        if status.is_success(expected_status) and self.MEMORY_PROFILE_AMOUNT:
+            self.check_memory(role, owned=owned)
+
+    def check_memory(self, role: str, owned: bool = False):
+        """
+        Request list of MEMORY_PROFILE_AMOUNT instances with tracemalloc tracing, record the peak memory of the view
+        and render in self.memory_profiles, per request and per serialized item, and fail if it exceeds MEMORY_BUDGET
+        - The view is called directly: no budgets or timing of dispatch are applied, or traced
+        - A running tracemalloc (e.g. of a benchmark) is reused; without reset_peak (Python < 3.9)
+        its traces can't be kept apart, and the profile is skipped
+        """
+        tracing = tracemalloc.is_tracing()
+        if tracing and not hasattr(tracemalloc, "reset_peak"):
+            logger.warning("%s memory profile skipped: tracemalloc is already tracing", self.id())
+            return
+        user = self.get_request_user(role)
+        action = action_name("list", owned)
+        view = self.get_view()
+        with self.savepoint():
+            instances = create_instances(self.factory, self.MEMORY_PROFILE_AMOUNT, bulk=True)
+            if owned:
+                self.set_owner(instances, user)
+            del instances
+            request = self.build_request(user, "get")
+            if tracing:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+            try:
+                start = tracemalloc.get_traced_memory()[0]
+                response = view(request)
+                response.render()
+                peak = tracemalloc.get_traced_memory()[1] - start
+            finally:
+                if not tracing:
+                    tracemalloc.stop()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            items = response.data["results"] if isinstance(response.data, dict) else response.data
+        record = {
+            "test": self.id(),
+            "role": role,
+            "action": action,
+            "instances": self.MEMORY_PROFILE_AMOUNT,
+            "items": len(items),
+            "peak_bytes": peak,
+            "item_bytes": peak / len(items) if items else 0,
+        }
+        self.__dict__.setdefault("memory_profiles", []).append(record)
+        if self.MEMORY_BUDGET is not None and peak > self.MEMORY_BUDGET:
+            rows = [
+                ("instances", "items", "peak KiB", "KiB per item", "budget KiB"),
+                (
+                    record["instances"],
+                    record["items"],
+                    f"{peak / 1024:.1f}",
+                    f"{record['item_bytes'] / 1024:.2f}",
+                    f"{self.MEMORY_BUDGET / 1024:.1f}",
+                ),
+            ]
+            self.fail(f"{role.capitalize()} user {action} peak memory is above budget:\n{format_table(rows)}")
+
+    def has_payload_budget(self) -> bool:
+        """
+        Return True if list responses have a size budget (MAX_LIST_BYTES or MAX_ITEM_BYTES), which enables timing
+        """
+        return self.MAX_LIST_BYTES is not None or self.MAX_ITEM_BYTES is not None
+
+    def check_payload(self, response, items: int, action: str, role: str, timing: dict = None):
+        """
+        Record the size of the rendered response to a list of items in self.payloads, with the serializer time
+        of its timing (see timed_dispatch), and fail if it exceeds MAX_LIST_BYTES, or MAX_ITEM_BYTES per item
+        (e.g. nested serializers of whole objects)
+        """
+        response.render()
+        size = len(response.content)
+        item_bytes = size / items if items else 0
+        serializer_ms = timing["serializer"] / 1e6 if timing is not None else None
+        record = {
+            "test": self.id(),
+            "role": role,
+            "action": action,
+            "bytes": size,
+            "items": items,
+            "item_bytes": item_bytes,
+            "serializer_ms": serializer_ms,
+        }
+        self.__dict__.setdefault("payloads", []).append(record)
+        too_large = self.MAX_LIST_BYTES is not None and size > self.MAX_LIST_BYTES
+        too_large = too_large or self.MAX_ITEM_BYTES is not None and item_bytes > self.MAX_ITEM_BYTES
+        if too_large:
+            rows = [
+                ("bytes", "items", "bytes per item", "serializer ms", "max bytes", "max bytes per item"),
+                (
+                    size,
+                    items,
+                    f"{item_bytes:.1f}",
+                    f"{serializer_ms:.2f}" if serializer_ms is not None else "-",
+                    self.MAX_LIST_BYTES,
+                    self.MAX_ITEM_BYTES,
+                ),
+            ]
+            self.fail(f"{role.capitalize()} user {action} response is too large:\n{format_table(rows)}")
+
+    @contextmanager
+    def count_fetched_rows(self):
+        """
+        Yield a list holding the amount of instances of model built (rows fetched) inside the block
+        """
+        fetched = [0]
+
+        def count(sender, **kwargs):
+            fetched[0] += 1
+
+        signals.post_init.connect(count, sender=self.model, weak=False)
+        try:
+            yield fetched
+        finally:
+            signals.post_init.disconnect(count, sender=self.model)
+
+    def check_owned_filtering(self, role: str):
+        """
+        Request the owned list among FOREIGN_MIX_AMOUNT instances, a FOREIGN_RATIO of them owned by another user:
+        - Fail if instances of the other user are returned
+        - Fail if queries or fetched rows grow with the foreign instances (unindexed or Python side filtering)
+        """
+        user = self.get_request_user(role)
+        data = getattr(self, ROLES[role][0])
+        username = User.USERNAME_FIELD
+        foreign_user = self.get_role_user(role, {**data, username: f"foreign_{data[username]}"})
+        foreign_amount = int(self.FOREIGN_MIX_AMOUNT * self.FOREIGN_RATIO)
+        owned_amount = max(1, self.FOREIGN_MIX_AMOUNT - foreign_amount)
+        costs = [("foreign instances", "queries", "fetched rows")]
+        with self.savepoint():
+            owned = create_instances(self.factory, owned_amount, bulk=True)
+            self.set_owner(owned, user)
+            owned_pks = {instance.pk for instance in owned}
+            for amount in (0, foreign_amount):
+                if amount:
+                    foreign = create_instances(self.factory, amount, bulk=True)
+                    self.set_owner(foreign, foreign_user)
+                request = self.build_request(user, "get")
+                with CaptureQueriesContext(connection) as queries, self.count_fetched_rows() as fetched:
+                    response = self.dispatch(request)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                costs.append((amount, len(queries), fetched[0]))
+                if self.EXPLAIN_SCAN_ROWS is not None:
+                    self.check_query_plans(queries.captured_queries, "list_owned", role)
+            items = response.data["results"] if isinstance(response.data, dict) else response.data
+            received = self.get_response_pks(items)
+        self.assertIsNotNone(received, "Owned filtering check requires the primary key in serialized instances")
+        leaked = received - owned_pks
+        if leaked:
+            self.fail(f"{role.capitalize()} user list_owned returns {len(leaked)} instances of another user")
+        (_, base_queries, base_fetched), (_, mixed_queries, mixed_fetched) = costs[1:]
+        if mixed_queries > base_queries or mixed_fetched > base_fetched:
+            self.fail(
+                f"{role.capitalize()} user list_owned cost grows with instances of another user:\n"
+                f"{format_table(costs)}"
+            )
+
+    def check_query_scaling(self, role: str, owned: bool = False):
+        """
+        Request list with each amount of instances in N_PLUS_ONE_AMOUNTS,
+        and fail if the count of any statement grows with the amount (N+1 queries)
+        """
+        user = self.get_request_user(role)
+        amounts = sorted(self.N_PLUS_ONE_AMOUNTS)
+        counts = []
+        for amount in amounts:
+            with self.savepoint():
+                instances = create_instances(self.factory, amount, self.BULK_CREATE)
+                if owned:
+                    self.set_owner(instances, user)
+                request = self.build_request(user, "get")
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.dispatch(request)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                counts.append({sql: count for count, sql in group_queries(queries.captured_queries)})
+        scaling = [sql for sql in counts[-1] if counts[-1][sql] > counts[0].get(sql, 0)]
+        if scaling:
+            rows = [tuple(f"n={amount}" for amount in amounts) + ("statement",)]
+            rows += [tuple(count.get(sql, 0) for count in counts) + (sql,) for sql in scaling]
+            self.fail(
+                f"{role.capitalize()} user {action_name('list', owned)} queries grow with instances:\n"
+                f"{format_table(rows)}"
+            )
+
+    def check_retrieve(self, role: str, expected_status: int, owned: bool = False):
+        """
+        Request details of existing instance
+        """
+        user = self.get_request_user(role)
+        with self.savepoint():
+            instance = self.get_model_instance(mutates=owned)
+            if owned:
+                self.set_owner([instance], user)
+            request = self.build_request(user, "get")
+            response = self.dispatch(request, action_name("retrieve", owned), role, pk=instance.pk)
+            self.assertEqual(response.status_code, expected_status)
+
+    def check_create(self, role: str, expected_status: int, owned: bool = False):
+        """
+        Post instance_data (owned by user if owned), and assert instance is created on success
+        """
+        user = self.get_request_user(role)
+        with self.savepoint():
+            data = {}
+            if status.is_success(expected_status):
+                data = dict(self.instance_data)
+                if owned:
+                    data.update(self.get_owner_data(user))
+            request = self.build_request(user, "post", data=data)
+            response = self.dispatch(request, action_name("create", owned), role)
+            self.assertEqual(response.status_code, expected_status)
+            if status.is_success(expected_status):
+                self.assertTrue(self.model.objects.filter(pk=response.data["id"]).exists())
+                self.check_equal_data(data, response.data)
+
+    def check_update(self, role: str, expected_status: int, owned: bool = False):
+        """
+        Put instance_data on existing instance, and assert it is returned on success
+        """
+        user = self.get_request_user(role)
+        with self.savepoint():
+            instance = self.get_model_instance(mutates=True)
+            if owned:
+                self.set_owner([instance], user)
+            data = self.instance_data if status.is_success(expected_status) else {}
+            request = self.build_request(user, "put", data=data)
+            response = self.dispatch(request, action_name("update", owned), role, pk=instance.pk)
+            self.assertEqual(response.status_code, expected_status)
+            if status.is_success(expected_status):
+                self.check_equal_data(data, response.data)
+
+    def check_destroy(self, role: str, expected_status: int, owned: bool = False):
+        """
+        Delete existing instance, and assert it only exists on db if request failed
+        """
+        user = self.get_request_user(role)
+        with self.savepoint():
+            instance = self.get_model_instance(mutates=True)
+            if owned:
+                self.set_owner([instance], user)
+            request = self.build_request(user, "delete")
+            response = self.dispatch(request, action_name("destroy", owned), role, pk=instance.pk)
+            self.assertEqual(response.status_code, expected_status)
+            if status.is_success(expected_status):
+                self.assertFalse(self.model.objects.filter(pk=instance.pk).exists())
+            else:
+                self.assertTrue(self.model.objects.filter(pk=instance.pk).exists())
+
+    def get_paginator(self):
+        """
+        Return an instance of the pagination_class of the view, or None
+        """
+        pagination_class = getattr(getattr(self.get_view(), "cls", None), "pagination_class", None)
+        return pagination_class() if pagination_class is not None else None
+
+    def get_page_path(self, paginator, page_size: int, offset: int = 0) -> tuple:
+        """
+        Return the path of a page of page_size instances, and the max size of the page:
+        - LimitOffsetPagination (and views without pagination_class): limit and offset query params
+        - PageNumberPagination: first page
+        - CursorPagination: first page (cursors are opaque, next pages are reached through next links)
+        The page size is the one of the paginator if it has no page_size_query_param.
+        """
+        if isinstance(paginator, (PageNumberPagination, CursorPagination)):
+            params = {}
+            if paginator.page_size_query_param:
+                params[paginator.page_size_query_param] = page_size
+            else:
+                page_size = paginator.page_size
+        elif isinstance(paginator, LimitOffsetPagination):
+            params = {paginator.limit_query_param: page_size, paginator.offset_query_param: offset}
         else:
-            return [self.factory() for i in range(random.randint(self.MIN, self.MAX))]
+            params = {"limit": page_size, "offset": offset}
+        path = f"{self.endpoint}?{urlencode(params)}" if params else self.endpoint
+        return path, page_size
+
+    def check_paginate(self, role: str, expected_status: int, owned: bool = False):
+        """
+        Request a page of instances with the pagination of the view, and assert page size on success
+        """
+        user = self.get_request_user(role)
+        with self.savepoint():
+            self.get_model_instances()
+            path, page_size = self.get_page_path(self.get_paginator(), 5, offset=10)
+            request = self.build_request(user, "get", path=path)
+            response = self.dispatch(request, "paginate", role)
+            self.assertEqual(response.status_code, expected_status)
+            if status.is_success(expected_status):
+                self.assertTrue(len(response.data["results"]) <= page_size)
+        if status.is_success(expected_status) and self.PAGINATION_WALK_AMOUNT:
+            self.check_pagination_walk(role)
+
+    def check_pagination_walk(self, role: str):
+        """
+        Create PAGINATION_WALK_AMOUNT instances, and walk every page of the list following next links:
+        - Fail if an instance is returned twice (duplicates) or never (gaps)
+        - Per page budgets of the paginate action (QUERY_BUDGET, LATENCY_BUDGET_MS) apply to deep pages too
+        - Cursor pagination must keep a constant cost (see check_constant_page_cost)
+        - Items, latency, queries and fetched rows of each page are kept in self.page_costs
+        Only primary keys are kept, not the pages.
+        """
+        user = self.get_request_user(role)
+        paginator = self.get_paginator()
+        self.page_costs = [("page", "items", "ms", "queries", "rows")]
+        with self.savepoint():
+            instances = create_instances(self.factory, self.PAGINATION_WALK_AMOUNT, bulk=True)
+            expected = {instance.pk for instance in instances}
+            del instances
+            received = set()
+            path, page_size = self.get_page_path(paginator, self.PAGINATION_WALK_PAGE_SIZE)
+            while path:
+                request = self.build_request(user, "get", path=path)
+                with CaptureQueriesContext(connection) as queries, self.count_fetched_rows() as fetched:
+                    start = time.perf_counter_ns()
+                    response = self.dispatch(request, "paginate", role)
+                    elapsed = time.perf_counter_ns() - start
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                page = self.get_response_pks(response.data["results"])
+                self.assertIsNotNone(page, "Pagination walk requires the primary key in serialized instances")
+                self.assertLessEqual(len(page), page_size)
+                self.page_costs.append(
+                    (len(self.page_costs), len(page), round(elapsed / 1e6, 2), len(queries), fetched[0])
+                )
+                duplicates = received & page
+                if duplicates:
+                    self.fail(
+                        f"Page {len(self.page_costs) - 1} repeats {len(duplicates)} instances:\n"
+                        f"{format_table(self.page_costs)}"
+                    )
+                received |= page
+                path = response.data["next"]
+        missing = expected - received
+        if missing:
+            self.fail(f"{len(missing)} instances never returned by the pages:\n{format_table(self.page_costs)}")
+        if isinstance(paginator, CursorPagination):
+            self.check_constant_page_cost()
+
+    def check_constant_page_cost(self):
+        """
+        Fail if the pages of the last walk (self.page_costs) don't keep the cost of the first page:
+        - No page runs more queries, or fetches more rows, than the first one
+        - Median latency of the last 3 pages, over the one of the first 3, is logged and kept in
+        self.page_latency_ratio (wall clock, so it only fails above CURSOR_LATENCY_RATIO if set)
+        """
+        pages = self.page_costs[1:]
+        _, _, _, first_queries, first_rows = pages[0]
+        growing = [page for page, _, _, queries, rows in pages if queries > first_queries or rows > first_rows]
+        if growing:
+            self.fail(
+                f"Pages {growing} run more queries or fetch more rows than the first one:\n"
+                f"{format_table(self.page_costs)}"
+            )
+        if len(pages) <= 3:
+            return
+        first_ms = median(page[2] for page in pages[:3])
+        last_ms = median(page[2] for page in pages[-3:])
+        self.page_latency_ratio = last_ms / first_ms if first_ms else 1.0
+        logger.info("%s cursor pages latency ratio (last/first): %.2f", self.id(), self.page_latency_ratio)
+        if self.CURSOR_LATENCY_RATIO is not None and self.page_latency_ratio > self.CURSOR_LATENCY_RATIO:
+            self.fail(
+                f"Last pages take {last_ms:.2f} ms, first pages {first_ms:.2f} ms "
+                f"(max ratio {self.CURSOR_LATENCY_RATIO}):\n{format_table(self.page_costs)}"
+            )
 
     def setUp(self):
         """
@@ -95,10 +1169,10 @@ class BaseDrfTest:
         self.factory = None
         self.model = None
         self.instance_data = {}
-        self.view = viewsets.YourViewSet
+        self.viewset = viewsets.YourViewSet  # or self.view = viewsets.YourViewSet.as_view({...})
         self.user_data = {}     # Required for authenticated user testing
         self.admin_data = {}    # Required for super user testing
         self.staff_data = {}    # Required for staff user testing
-        self.USER_FIELD_NAME = 'creator'    # Required for testing user object access
+        self.USER_FIELD_NAME = 'creator'    # Required for testing user object access (or 'project__owner', [...])
         """
         return NotImplementedError("You need to override BaseDrfTest.setUp()")
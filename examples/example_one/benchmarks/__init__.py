@@ -0,0 +1,9 @@
+"""
+Benchmarks of drf_tester's own overhead, running the tests of the example project
+
+Usage, from examples/example_one:
+
+    python -m benchmarks --amounts 5 50 --databases memory file --output baseline.json
+    python -m benchmarks --baseline baseline.json
+
+"""
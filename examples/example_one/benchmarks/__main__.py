@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+from .suite import DATABASES, TEST_CLASSES, compare, run, run_databases, setup_django
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark drf_tester on example_one")
+    parser.add_argument("--amounts", type=int, nargs="+", default=[5, 50], help="values of EXACT_AMOUNT")
+    parser.add_argument("--databases", nargs="+", choices=DATABASES, default=list(DATABASES))
+    parser.add_argument("--tests", nargs="+", choices=TEST_CLASSES, default=list(TEST_CLASSES))
+    parser.add_argument("--repeat", type=int, default=3, help="timing passes, the fastest is kept")
+    parser.add_argument("--output", help="JSON file for the results (printed if missing)")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="wall time ratio considered a regression")
+    args = parser.parse_args(argv)
+
+    if len(args.databases) == 1:
+        results = run(args.amounts, args.databases[0], args.tests, args.repeat)
+    else:
+        results = run_databases(args.amounts, args.databases, args.tests, args.repeat)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    elif not args.baseline:
+        json.dump(results, sys.stdout, indent=2)
+
+    if args.baseline:
+        setup_django()
+        from drf_tester.utils import format_table
+
+        with open(args.baseline) as baseline:
+            rows = compare(results, json.load(baseline), args.threshold)
+        if len(rows) > 1:
+            print(f"Regressions against {args.baseline}:\n{format_table(rows)}")
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Run the test classes of the example project and measure each test:
+- wall time, and the part of it spent in factories, user creation and view dispatch
+- queries
+- memory allocations (in a separate pass, as tracemalloc slows everything down)
+
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import unittest
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+import django
+
+TEST_CLASSES = ("ThingViewSetTest", "ThingViewSet2Test", "ThingViewSet3Test", "PropertyViewSetTest")
+DATABASES = ("memory", "file")
+PHASES = ("factories", "users", "dispatch")
+
+
+def setup_django():
+    """
+    Configure django with the settings of the example project
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "example_one.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database(database: str):
+    """
+    Create the test database: SQLite in memory ("memory") or on a temporary file ("file")
+    """
+    from django.db import connection
+
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    test_name = test_settings.get("NAME")
+    with tempfile.TemporaryDirectory() as directory:
+        if database == "file":
+            test_settings["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings["NAME"] = test_name
+
+
+def with_amount(test_class, amount: int):
+    """
+    Return subclass of test_class creating exactly amount instances
+    """
+    return type(test_class.__name__, (test_class,), {"EXACT_AMOUNT": amount, "__module__": test_class.__module__})
+
+
+class PhaseTimer:
+    """
+    Accumulate the time spent in wrapped functions, by phase
+    """
+
+    def __init__(self):
+        self.totals = dict.fromkeys(PHASES, 0)
+
+    def reset(self) -> dict:
+        """
+        Return accumulated totals, and start again from zero
+        """
+        totals, self.totals = self.totals, dict.fromkeys(PHASES, 0)
+        return totals
+
+    def wrap(self, phase: str, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter_ns() - start
+
+        return timed
+
+
+class BenchmarkResult(unittest.TestResult):
+    """
+    Test result keeping a record of measures for each test, and for each class setup
+    """
+
+    def __init__(self, timer: PhaseTimer, allocations: bool):
+        super().__init__()
+        self.timer = timer
+        self.allocations = allocations
+        self.records = []
+        self.test_class = None
+        self.mark = time.perf_counter_ns()
+
+    def startTest(self, test):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        super().startTest(test)
+        now = time.perf_counter_ns()
+        if type(test) is not self.test_class:
+            # time since the previous test was spent setting up this class (setUpTestData)
+            self.test_class = type(test)
+            test_id = f"{self.test_class.__module__}.{self.test_class.__qualname__}.setUpClass"
+            self.add_record(test_id, "ok", now - self.mark, self.timer.reset(), None, None)
+        self.timer.reset()
+        self.queries = CaptureQueriesContext(connection)
+        self.queries.__enter__()
+        if self.allocations:
+            # peak of blocks allocated from now on
+            tracemalloc.clear_traces()
+        self.start = time.perf_counter_ns()
+
+    def stopTest(self, test):
+        wall = time.perf_counter_ns() - self.start
+        peak = tracemalloc.get_traced_memory()[1] if self.allocations else None
+        self.queries.__exit__(None, None, None)
+        test_status = "ok"
+        if any(test is failed for failed, _ in self.failures + self.errors):
+            test_status = "failed"
+        self.add_record(test.id(), test_status, wall, self.timer.reset(), len(self.queries), peak)
+        self.mark = time.perf_counter_ns()
+        super().stopTest(test)
+
+    def add_record(self, test_id: str, test_status: str, wall: int, phases: dict, queries, peak):
+        self.records.append(
+            {
+                "test": test_id,
+                "status": test_status,
+                "wall_ms": wall / 1e6,
+                "phases_ms": {phase: ns / 1e6 for phase, ns in phases.items()},
+                "queries": queries,
+                "alloc_peak_kb": peak / 1024 if peak is not None else None,
+            }
+        )
+
+
+def run_suite(test_classes: list, allocations: bool = False) -> list:
+    """
+    Run all tests in test_classes, and return the record of each one
+    """
+    from drf_tester import utils
+
+    timer = PhaseTimer()
+    suite = unittest.TestSuite(
+        unittest.defaultTestLoader.loadTestsFromTestCase(test_class) for test_class in test_classes
+    )
+    result = BenchmarkResult(timer, allocations)
+    with ExitStack() as stack:
+        stack.enter_context(
+            mock.patch.object(utils, "create_instances", timer.wrap("factories", utils.create_instances))
+        )
+        stack.enter_context(mock.patch.object(utils, "create_user", timer.wrap("users", utils.create_user)))
+        stack.enter_context(
+            mock.patch.object(utils.BaseDrfTest, "dispatch", timer.wrap("dispatch", utils.BaseDrfTest.dispatch))
+        )
+        if allocations:
+            tracemalloc.start()
+            stack.callback(tracemalloc.stop)
+        suite.run(result)
+    return result.records
+
+
+def merge(passes: list, allocation_records: list) -> list:
+    """
+    Return one record per test: the fastest of the timing passes, with the allocations pass peak
+    """
+    peaks = {record["test"]: record["alloc_peak_kb"] for record in allocation_records}
+    records = []
+    for test_records in zip(*passes):
+        record = dict(min(test_records, key=lambda record: record["wall_ms"]))
+        record["alloc_peak_kb"] = peaks.get(record["test"])
+        records.append(record)
+    return records
+
+
+def run(amounts: list, database: str, test_classes: list = TEST_CLASSES, repeat: int = 3) -> dict:
+    """
+    Run the test classes of the example project on database, for every amount of instances
+    """
+    setup_django()
+    from django.test.utils import setup_test_environment
+    from things import tests
+
+    setup_test_environment()
+    results = []
+    with test_database(database):
+        for amount in amounts:
+            classes = [with_amount(getattr(tests, name), amount) for name in test_classes]
+            passes = [run_suite(classes) for i in range(repeat)]
+            for record in merge(passes, run_suite(classes, allocations=True)):
+                results.append({"database": database, "amount": amount, **record})
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def run_databases(amounts: list, databases: list, test_classes: list = TEST_CLASSES, repeat: int = 3) -> dict:
+    """
+    Run the benchmarks on each database in its own process (one test database per process), and merge results
+    """
+    results = None
+    with tempfile.TemporaryDirectory() as directory:
+        for database in databases:
+            output = os.path.join(directory, f"{database}.json")
+            command = [sys.executable, "-m", "benchmarks", "--databases", database, "--output", output]
+            command += ["--amounts", *map(str, amounts), "--tests", *test_classes, "--repeat", str(repeat)]
+            subprocess.run(command, check=True)
+            with open(output) as database_output:
+                database_results = json.load(database_output)
+            if results is None:
+                results = database_results
+            else:
+                results["results"] += database_results["results"]
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Return rows (header first) of tests slower than in baseline by more than threshold (ratio),
+    or running more queries
+    """
+    previous = {(r["database"], r["amount"], r["test"]): r for r in baseline["results"]}
+    rows = [("database", "amount", "test", "wall ms", "baseline ms", "ratio", "queries", "baseline queries")]
+    for record in results["results"]:
+        base = previous.get((record["database"], record["amount"], record["test"]))
+        if base is None:
+            continue
+        ratio = record["wall_ms"] / base["wall_ms"] if base["wall_ms"] else 1.0
+        more_queries = (record["queries"] or 0) > (base["queries"] or 0)
+        if ratio > threshold or more_queries:
+            rows.append(
+                (
+                    record["database"],
+                    record["amount"],
+                    record["test"],
+                    f"{record['wall_ms']:.2f}",
+                    f"{base['wall_ms']:.2f}",
+                    f"{ratio:.2f}",
+                    record["queries"],
+                    base["queries"],
+                )
+            )
+    return rows
@@ -6,8 +6,11 @@ from things import views as thing_views
 router = routers.DefaultRouter()
 
 
-router.register("things/is_authenticated/", thing_views.ThingViewSet, basename="things-auth-only")
-router.register("things/auth_or_readonly/", thing_views.ThingViewSet3, basename="things-auth-or-readonly")
-router.register("things/allow_any/", thing_views.ThingViewSet3, basename="things-allow-any")
+router.register("things/is_authenticated", thing_views.ThingViewSet, basename="things-auth-only")
+router.register("things/auth_or_readonly", thing_views.ThingViewSet2, basename="things-auth-or-readonly")
+router.register("things/allow_any", thing_views.ThingViewSet3, basename="things-allow-any")
+router.register("things/paginated", thing_views.ThingPaginatedViewSet, basename="things-paginated")
+router.register("things/page_number", thing_views.ThingPageNumberViewSet, basename="things-page-number")
+router.register("things/cursor", thing_views.ThingCursorViewSet, basename="things-cursor")
 
-router.register("property/", thing_views.PropertyViewSet, basename="property")
+router.register("property", thing_views.PropertyViewSet, basename="property")
@@ -1,10 +1,11 @@
 import datetime
 
+from factory import SubFactory
 from factory.django import DjangoModelFactory
 from factory.fuzzy import FuzzyDecimal, FuzzyInteger, FuzzyText
 from faker import Faker
 
-from .models import Property, Thing
+from .models import Project, Property, Task, Thing
 
 fake = Faker()
 
@@ -26,3 +27,19 @@ class PropertyFactory(DjangoModelFactory):
 
     class Meta:
         model = Property
+
+
+class ProjectFactory(DjangoModelFactory):
+    name = FuzzyText(prefix="PROJECT_", length=10)
+    owner = None
+
+    class Meta:
+        model = Project
+
+
+class TaskFactory(DjangoModelFactory):
+    name = FuzzyText(prefix="TASK_", length=10)
+    project = SubFactory(ProjectFactory)
+
+    class Meta:
+        model = Task
@@ -17,3 +17,14 @@ class Thing(models.Model):
 class Property(models.Model):
     name = models.CharField(max_length=100, null=True, blank=True)
     creator = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+
+
+class Project(models.Model):
+    name = models.CharField(max_length=100, null=True, blank=True)
+    owner = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name="owned_projects")
+    members = models.ManyToManyField(User, blank=True, related_name="projects")
+
+
+class Task(models.Model):
+    name = models.CharField(max_length=100, null=True, blank=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import Property, Thing
+from .models import Project, Property, Task, Thing
 
 
 class ThingSerializer(serializers.ModelSerializer):
@@ -13,3 +13,17 @@ class PropertySerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
         fields = "__all__"
+
+
+class ProjectSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Project
+        fields = "__all__"
+
+
+class TaskSerializer(serializers.ModelSerializer):
+    project_name = serializers.CharField(source="project.name", read_only=True)
+
+    class Meta:
+        model = Task
+        fields = "__all__"
@@ -0,0 +1,73 @@
+"""
+Test classes generated for the endpoints of the router, with inferred access
+"""
+import sys
+import types
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from example_one.routers import router
+from rest_framework import routers, viewsets
+from rest_framework.response import Response
+
+from drf_tester import discovery
+
+from . import factories, models, serializers, views
+
+load_tests = discovery.get_load_tests(router, "/api/v1/", module=__name__, factories=factories)
+
+
+class UrlconfEndpointsTest(SimpleTestCase):
+    """
+    Endpoints found in the URLconf
+    """
+
+    def test_urlconf_endpoints_match_router(self):
+        """The list routes of the URLconf are the endpoints of the router, under its path"""
+        urlconf_endpoints = discovery.get_urlconf_endpoints()
+        router_endpoints = discovery.get_router_endpoints(router, "/api/v1/")
+        self.assertEqual(sorted(urlconf_endpoints), sorted(router_endpoints))
+
+
+class PlainViewSet(viewsets.ViewSet):
+    """
+    ViewSet without queryset
+    """
+
+    def list(self, request):
+        return Response([])
+
+
+class GetQuerysetViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    GenericViewSet with get_queryset only
+    """
+
+    serializer_class = serializers.ThingSerializer
+
+    def get_queryset(self):
+        return models.Thing.objects.all()
+
+
+class QuerysetlessEndpointsTest(SimpleTestCase):
+    """
+    Endpoints whose model can't be inferred
+    """
+
+    def test_viewsets_without_queryset_are_skipped(self):
+        """Viewsets without queryset attribute get a skipped test, and the other endpoints are still tested"""
+        queryset_router = routers.SimpleRouter()
+        queryset_router.register("plain", PlainViewSet, basename="plain")
+        queryset_router.register("get_queryset", GetQuerysetViewSet, basename="get_queryset")
+        queryset_router.register("things", views.ThingViewSet, basename="things")
+        module = types.ModuleType("things.generated_tests")
+        with mock.patch.dict(sys.modules, {module.__name__: module}):
+            load_tests = discovery.get_load_tests(queryset_router, module=module, factories=factories)
+            tests = load_tests(unittest.defaultTestLoader, unittest.TestSuite(), None)
+        reasons = {type(test).__name__: getattr(type(test), "__unittest_skip_why__", None) for test in tests}
+        reason = "No queryset attribute, model can't be inferred"
+        self.assertEqual(reasons.pop("PlainViewSetPlainTest"), reason)
+        self.assertEqual(reasons.pop("GetQuerysetViewSetGetQuerysetTest"), reason)
+        self.assertEqual(reasons, {"ThingViewSetThingsTest": None})
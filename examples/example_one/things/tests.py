@@ -1,13 +1,32 @@
 import datetime
+import decimal
+import os
+import threading
+import types
+import unittest
+from unittest import mock
 
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import signals
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
 from rest_framework.test import APIRequestFactory, APITestCase
 
+from drf_tester import load, profiling
+from drf_tester.matrix import FULL_ACCESS, AccessMatrix, read_only
+from drf_tester.utils import SEED_ENV, BaseDrfTest, assign_owner, create_instances, create_user, log_seed
+from drf_tester.viewsets import admin, auth
 from drf_tester.viewsets.admin import AdminFullAccess
 from drf_tester.viewsets.anon import AnonFullAccess, AnonNoAccess, AnonReadOnly
 from drf_tester.viewsets.auth import AuthFullAccess, AuthOwner
 from drf_tester.viewsets.staff import StaffReadOnly
 
-from . import factories, models, views
+from . import factories, models, serializers, views
 
 # Create your tests here.
 
@@ -22,6 +41,11 @@ ADMIN_DATA = {
     "password": "jioqwehjnr890qweufnrereo8we",
 }
 
+STAFF_DATA = {
+    "username": "staff_user",
+    "password": "jioqwehjnr890qweufnstaffo8we",
+}
+
 THING_INSTANCE_DATA = {
     "name": "test thing name",
     "number": 5,
@@ -47,6 +71,316 @@ class ThingViewSetTest(APITestCase, AnonNoAccess, AuthFullAccess, AdminFullAcces
         self.admin_data = ADMIN_DATA
 
 
+class ThingViewSetRoutesTest(APITestCase, AnonNoAccess, AuthFullAccess, AdminFullAccess):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    Requests dispatched to the list and detail routes of the viewset class
+    """
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+    def test_routes_built_once(self):
+        """The views of the list and detail routes are built once per viewset, with the actions of each route"""
+        list_view, detail_view = self.get_view(), self.get_view(detail=True)
+        self.assertIs(self.get_view(), list_view)
+        self.assertIs(self.get_view(detail=True), detail_view)
+        self.assertLessEqual(self.LIST_ACTIONS.items(), list_view.actions.items())
+        self.assertLessEqual(self.DETAIL_ACTIONS.items(), detail_view.actions.items())
+
+
+class ThingViewSetJsonTest(APITestCase, AnonNoAccess, AuthFullAccess, AdminFullAccess):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    JSON bodies
+    """
+
+    REQUEST_FORMAT = "json"
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+
+class ThingRequestBodyTest(APITestCase, BaseDrfTest):
+    """
+    Request bodies encoded once per test class
+    """
+
+    REQUEST_FORMAT = "json"
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+
+    def test_request_body_encoded_once_per_class(self):
+        """Other tests of the class reuse the body of the same data, equal but not the same dict"""
+        data = {"name": "encoded once", "number": 1}
+        with mock.patch.object(JSONRenderer, "render", autospec=True, side_effect=JSONRenderer.render) as render:
+            body, content_type = self.get_request_body(data)
+            other_test = type(self)(self._testMethodName)
+            self.assertEqual(other_test.get_request_body(dict(data)), (body, content_type))
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(content_type, "application/json")
+
+    def test_request_bodies_keep_value_types_apart(self):
+        """Data only differing by the type of a value is encoded separately"""
+        decimal_body, content_type = self.get_request_body({"decimal_number": decimal.Decimal("1.50")})
+        string_body, _ = self.get_request_body({"decimal_number": "1.50"})
+        self.assertNotEqual(decimal_body, string_body)
+        self.assertEqual(content_type, "application/json")
+
+
+class ThingViewSetQueryBudgetTest(APITestCase, AnonNoAccess, AuthFullAccess, AdminFullAccess):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    Queries of each action within a budget
+    """
+
+    QUERY_BUDGET = {"list": 1, "retrieve": 1, "create": 1, "update": 2, "destroy": 2}
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+
+class ThingViewSetPayloadTest(APITestCase, auth.CanList, admin.CanList):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    List responses within a size budget
+    """
+
+    MAX_ITEM_BYTES = 200
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+    def test_payload_budget_fails(self):
+        """List responses above MAX_LIST_BYTES fail with their size and the budgets"""
+        self.MAX_LIST_BYTES = 100
+        with self.assertRaises(AssertionError) as failure:
+            self.check_list("auth", status.HTTP_200_OK)
+        payload = self.payloads[-1]
+        report = str(failure.exception)
+        self.assertIn("Auth user list response is too large:", report)
+        self.assertIn("max bytes  max bytes per item\n", report)
+        self.assertRegex(
+            report, rf"(?m)^{payload['bytes']}\s+{payload['items']}\s+{payload['item_bytes']:.1f}\s+\S+\s+100\s+200$"
+        )
+        self.assertGreater(payload["bytes"], 100)
+
+
+class ThingViewSetMemoryTest(APITestCase, auth.CanList):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    Peak memory of a large list within a budget
+    """
+
+    MEMORY_PROFILE_AMOUNT = 1000
+    MEMORY_BUDGET = 8 * 2**20
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet
+        self.user_data = USER_DATA
+
+
+class ThingViewSetTimingTest(APITestCase, BaseDrfTest):
+    """
+    Thing viewset tests
+    Timing of requests, and latency budgets
+    """
+
+    TIMING = True
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet
+        self.user_data = USER_DATA
+
+    def test_timing_is_recorded(self):
+        """Phases of timed requests are recorded with the test, role and action"""
+        self.check_list("auth", status.HTTP_200_OK)
+        record = self.timings[-1]
+        self.assertEqual((record["test"], record["role"], record["action"]), (self.id(), "auth", "list"))
+        self.assertGreater(record["serializer"], 0)
+        self.assertLess(record["serializer"], record["view"])
+        self.assertIn(record, profiling.TIMINGS)
+
+    def test_payload_is_recorded_with_its_timing(self):
+        """List payloads are recorded with the serializer time of their own request"""
+        self.check_list("auth", status.HTTP_200_OK)
+        payload = self.payloads[-1]
+        self.assertEqual((payload["role"], payload["action"]), ("auth", "list"))
+        self.assertGreater(payload["bytes"], 0)
+        self.assertEqual(payload["serializer_ms"], self.last_timing["serializer"] / 1e6)
+
+    def test_memory_profile_is_not_timed(self):
+        """Memory profiles call the view directly, without recording timings"""
+        self.MEMORY_PROFILE_AMOUNT = 50
+        self.check_memory("auth")
+        self.assertEqual(self.memory_profiles[-1]["items"], 50)
+        self.assertNotIn("timings", self.__dict__)
+
+    def test_memory_profile_skipped_under_running_tracer(self):
+        """Without reset_peak, the traces of a running tracemalloc are kept and the profile is skipped"""
+        self.MEMORY_PROFILE_AMOUNT = 50
+        tracer = types.SimpleNamespace(is_tracing=lambda: True)
+        with mock.patch("drf_tester.utils.tracemalloc", tracer), self.assertLogs("drf_tester", "WARNING"):
+            self.check_memory("auth")
+        self.assertNotIn("memory_profiles", self.__dict__)
+
+    def test_latency_budget_fails(self):
+        """Requests slower than their LATENCY_BUDGET_MS fail"""
+        self.LATENCY_BUDGET_MS = {"list": {"auth": 0}}
+        with self.assertRaises(AssertionError) as failure:
+            self.check_list("auth", status.HTTP_200_OK)
+        self.assertIn("Auth user list took", str(failure.exception))
+        self.assertIn("budget is 0 ms", str(failure.exception))
+
+    def test_other_threads_are_not_timed(self):
+        """Serializers of other threads are not timed, and BaseSerializer.data is restored afterwards"""
+        data = BaseSerializer.data
+        with profiling.SerializerTimer() as timer:
+            thread = threading.Thread(target=lambda: serializers.ThingSerializer(models.Thing(name="other")).data)
+            thread.start()
+            thread.join()
+        self.assertEqual(timer.ns, 0)
+        self.assertIs(BaseSerializer.data, data)
+
+
+class ThingSeedTest(APITestCase, BaseDrfTest):
+    """
+    Random data reproduced from SEED
+    """
+
+    SEED = 1234
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+
+    def build_random_data(self) -> list:
+        self.seed_random()
+        things = factories.ThingFactory.build_batch(3)
+        return [self.get_instance_amount()] + [(thing.name, thing.number, thing.decimal_number) for thing in things]
+
+    @mock.patch.dict(os.environ)
+    def test_seed_reproduces_random_data(self):
+        """Instance amounts and factory output are the same for the same SEED, and change with it"""
+        os.environ.pop(SEED_ENV, None)
+        first = self.build_random_data()
+        self.assertEqual(self.build_random_data(), first)
+        with mock.patch.object(ThingSeedTest, "SEED", 4321):
+            self.assertNotEqual(self.build_random_data(), first)
+        os.environ[SEED_ENV] = "1234"
+        self.assertEqual(self.build_random_data(), first)
+
+    def test_failure_logs_seed(self):
+        """Failed tests log the seed to rerun them with"""
+        failing = log_seed(lambda self: self.fail("failure"))
+        with self.assertLogs("drf_tester", "ERROR") as logs, self.assertRaises(AssertionError):
+            failing(self)
+        self.assertIn(f"rerun with {SEED_ENV}={self.get_base_seed()}", logs.output[0])
+
+
+class ThingUserCacheTest(APITestCase, BaseDrfTest):
+    """
+    Users created once per test, role and data
+    """
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = dict(USER_DATA)
+        self.admin_data = dict(ADMIN_DATA)
+
+    def test_role_users_created_once(self):
+        """Every check of a role uses the same user, created on the first one, and the user data is not modified"""
+        users = get_user_model().objects.count()
+        self.check_list("auth", status.HTTP_200_OK)
+        self.check_create("auth", status.HTTP_201_CREATED)
+        self.check_retrieve("admin", status.HTTP_200_OK)
+        self.check_destroy("admin", status.HTTP_204_NO_CONTENT)
+        self.assertEqual(get_user_model().objects.count(), users + 2)
+        self.assertIs(self.get_active_user(self.user_data), self.get_request_user("auth"))
+        self.assertEqual(self.user_data, USER_DATA)
+        self.assertEqual(self.admin_data, ADMIN_DATA)
+
+    def test_other_data_is_another_user(self):
+        """Users of the same role with other data are other users, each created once"""
+        other_data = {**USER_DATA, "username": "other_user"}
+        other = self.get_active_user(other_data)
+        self.assertIsNot(other, self.get_active_user(self.user_data))
+        self.assertEqual(other.username, "other_user")
+        self.assertIs(self.get_active_user(dict(other_data)), other)
+
+
+class ThingPasswordTest(APITestCase, BaseDrfTest):
+    """
+    Passwords of created users
+    """
+
+    def setUp(self):
+        """Tests setup"""
+        self.user_data = USER_DATA
+
+    def test_fast_password_is_unusable(self):
+        """Users get an unusable password by default: no hashing, and no password login"""
+        user = self.get_request_user("auth")
+        self.assertFalse(user.has_usable_password())
+        self.assertFalse(self.client.login(username=USER_DATA["username"], password=USER_DATA["password"]))
+
+    def test_hashed_password(self):
+        """Without FAST_PASSWORDS, the password of the user data is hashed, and users can log in with it"""
+        self.FAST_PASSWORDS = False
+        user = self.get_request_user("auth")
+        self.assertTrue(user.check_password(USER_DATA["password"]))
+        self.assertTrue(self.client.login(username=USER_DATA["username"], password=USER_DATA["password"]))
+
+
 class ThingViewSet2Test(APITestCase, AnonReadOnly, AuthFullAccess, AdminFullAccess):
     """
     Thing viewset tests
@@ -66,6 +400,75 @@ class ThingViewSet2Test(APITestCase, AnonReadOnly, AuthFullAccess, AdminFullAcce
         self.admin_data = ADMIN_DATA
 
 
+class ThingViewSet2MatrixTest(APITestCase, BaseDrfTest):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticatedOrReadOnly
+    Tests generated from an access matrix
+    """
+
+    ACCESS_MATRIX = AccessMatrix(anon=read_only(), auth=FULL_ACCESS, admin=FULL_ACCESS)
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/auth_or_readonly/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.view = views.ThingViewSet2.as_view(
+            {"get": "list", "post": "create", "put": "update", "delete": "destroy"}
+        )
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+
+class ThingViewSet2ProbeTest(APITestCase, BaseDrfTest):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticatedOrReadOnly
+    One test per action, probing every role on the same instances
+    """
+
+    ACCESS_MATRIX = AccessMatrix(anon=read_only(), auth=FULL_ACCESS, admin=FULL_ACCESS)
+    COMBINED_PROBE = True
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/auth_or_readonly/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet2
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+    def test_probe_rolls_back_each_role(self):
+        """Each role is checked in turn, and its changes are rolled back before the next role"""
+        checked = []
+        check_access = self.check_access
+
+        def check_and_count(role, action, expected_status):
+            check_access(role, action, expected_status)
+            pool = [instance.pk for instance in self.instance_pool]
+            checked.append((role, models.Thing.objects.filter(pk__in=pool).count(), len(pool)))
+
+        self.check_access = check_and_count
+        self.check_roles("destroy", {"anon": 401, "auth": 204, "admin": 204})
+        self.assertEqual([role for role, _, _ in checked], ["anon", "auth", "admin"])
+        for role, remaining, pool_size in checked:
+            self.assertEqual(remaining, pool_size, f"{role} destroy was not rolled back")
+
+    def test_probe_reports_each_role(self):
+        """Unexpected statuses are reported per role, and created instances are rolled back"""
+        count = models.Thing.objects.count()
+        with self.assertRaises(AssertionError) as failure:
+            self.check_roles("create", {"anon": 201, "auth": 201})
+        report = str(failure.exception)
+        self.assertRegex(report, r"(?m)^anon\s+201\s+401\s+\S")
+        self.assertRegex(report, r"(?m)^auth\s+201\s+201$")
+        self.assertEqual(models.Thing.objects.count(), count)
+
+
 class ThingViewSet3Test(APITestCase, AnonFullAccess, AuthFullAccess, AdminFullAccess):
     """
     Thing viewset tests
@@ -85,6 +488,130 @@ class ThingViewSet3Test(APITestCase, AnonFullAccess, AuthFullAccess, AdminFullAc
         self.admin_data = ADMIN_DATA
 
 
+class ThingViewSet3FormTest(APITestCase, AnonFullAccess, AuthFullAccess, AdminFullAccess):
+    """
+    Thing viewset tests
+    Permission level: AllowAny
+    Url encoded form bodies
+    """
+
+    REQUEST_FORMAT = "form"
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/allow_any/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet3
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+
+class ThingViewSet3SharedTest(APITestCase, AnonFullAccess, AuthFullAccess, AdminFullAccess):
+    """
+    Thing viewset tests
+    Permission level: AllowAny
+    Users and instances shared by all tests in class
+    """
+
+    SHARED_FIXTURES = True
+    factory = factories.ThingFactory
+    user_data = USER_DATA
+    admin_data = ADMIN_DATA
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/allow_any/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingViewSet3
+        self.instance_data = THING_INSTANCE_DATA
+
+    def test_read_tests_create_nothing(self):
+        """List and retrieve use the users and instances of the class, without inserting any row"""
+        with CaptureQueriesContext(connection) as queries:
+            self.check_list("auth", status.HTTP_200_OK)
+            self.check_retrieve("admin", status.HTTP_200_OK)
+        inserts = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(inserts, [])
+
+    def test_destroy_keeps_shared_instance(self):
+        """Destroy deletes a copy of the shared instance, which is back in the database for the next tests"""
+        instance = self.shared_instances[0]
+        self.assertIsNot(self.get_model_instance(mutates=True), instance)
+        self.check_destroy("auth", status.HTTP_204_NO_CONTENT)
+        self.assertIsNotNone(instance.pk)
+        self.assertTrue(models.Thing.objects.filter(pk=instance.pk).exists())
+        self.assertEqual(self.get_model_instance(), instance)
+
+
+class ThingPaginatedViewSetTest(APITestCase, auth.CanPaginate, admin.CanPaginate):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    Every page of a large list is walked
+    """
+
+    PAGINATION_WALK_AMOUNT = 1000
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/paginated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.view = views.ThingPaginatedViewSet.as_view({"get": "list"})
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+
+class ThingPageNumberViewSetTest(APITestCase, auth.CanPaginate, admin.CanPaginate):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    Every page of a large list is walked, with the page size of the paginator
+    """
+
+    PAGINATION_WALK_AMOUNT = 500
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/page_number/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingPageNumberViewSet
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+    def test_walk_uses_page_size_of_paginator(self):
+        """Pages have the page size of the paginator, which has no page size query param"""
+        self.check_pagination_walk("auth")
+        self.assertEqual(len(self.page_costs) - 1, 500 // 20)
+        self.assertTrue(all(items == 20 for _, items, _, _, _ in self.page_costs[1:]))
+
+
+class ThingCursorViewSetTest(APITestCase, auth.CanPaginate, admin.CanPaginate):
+    """
+    Thing viewset tests
+    Permission level: IsAuthenticated
+    Every page of a large list is walked, at constant cost per page
+    """
+
+    PAGINATION_WALK_AMOUNT = 1000
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/cursor/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.view = views.ThingCursorViewSet.as_view({"get": "list"})
+        self.instance_data = THING_INSTANCE_DATA
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+
 class PropertyViewSetTest(APITestCase, AnonNoAccess, AuthOwner, AdminFullAccess, StaffReadOnly):
     """
     Auth Only.
@@ -104,4 +631,285 @@ class PropertyViewSetTest(APITestCase, AnonNoAccess, AuthOwner, AdminFullAccess,
         }
         self.user_data = USER_DATA
         self.admin_data = ADMIN_DATA
+        self.staff_data = STAFF_DATA
         self.USER_FIELD_NAME = "creator"
+
+
+class PropertyViewSetRoutesTest(APITestCase, AnonNoAccess, AuthOwner, AdminFullAccess, StaffReadOnly):
+    """
+    Auth Only.
+    Update and delete require user==instance.creator
+    Requests dispatched to the list and detail routes of the viewset class
+    """
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/property/"
+        self.factory = factories.PropertyFactory
+        self.model = models.Property
+        self.viewset = views.PropertyViewSet
+        self.instance_data = {
+            "name": "TEST property name",
+        }
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+        self.staff_data = STAFF_DATA
+        self.USER_FIELD_NAME = "creator"
+
+
+class PropertyForeignMixTest(APITestCase, auth.CanListOwned):
+    """
+    Auth Only.
+    Owned lists among the properties of another user
+    """
+
+    FOREIGN_MIX_AMOUNT = 1000
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/property/"
+        self.factory = factories.PropertyFactory
+        self.model = models.Property
+        self.viewset = views.PropertyViewSet
+        self.user_data = USER_DATA
+        self.USER_FIELD_NAME = "creator"
+
+    def test_leaked_instances_fail(self):
+        """Properties of another user in the owned list are reported"""
+        self.viewset = views.PropertyLeakyViewSet
+        with self.assertRaises(AssertionError) as failure:
+            self.check_owned_filtering("auth")
+        self.assertEqual(str(failure.exception), "Auth user list_owned returns 900 instances of another user")
+
+    def test_python_filtering_fails(self):
+        """Owned lists filtered in Python fetch the rows of another user, and are reported"""
+        self.viewset = views.PropertyPythonFilterViewSet
+        with self.assertRaises(AssertionError) as failure:
+            self.check_owned_filtering("auth")
+        report = str(failure.exception)
+        self.assertIn("Auth user list_owned cost grows with instances of another user:", report)
+        self.assertRegex(report, r"(?m)^0\s+1\s+100$")
+        self.assertRegex(report, r"(?m)^900\s+1\s+1000$")
+
+
+class PropertyExplainTest(APITestCase, auth.CanListOwned, auth.CanRetrieveOwned):
+    """
+    Auth Only.
+    Owned properties filtered on the indexed creator foreign key, among the properties of another user
+    """
+
+    FOREIGN_MIX_AMOUNT = 500
+    EXPLAIN_SCAN_ROWS = 100
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/property/"
+        self.factory = factories.PropertyFactory
+        self.model = models.Property
+        self.viewset = views.PropertyViewSet
+        self.user_data = USER_DATA
+        self.USER_FIELD_NAME = "creator"
+
+
+class ThingExplainTest(APITestCase, BaseDrfTest):
+    """
+    Things filtered on their name, which is not indexed
+    """
+
+    EXACT_AMOUNT = 50
+    EXPLAIN_SCAN_ROWS = 10
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/things/is_authenticated/"
+        self.factory = factories.ThingFactory
+        self.model = models.Thing
+        self.viewset = views.ThingNamePrefixViewSet
+        self.user_data = USER_DATA
+
+    def test_unindexed_filter_fails(self):
+        """Filtered lists fully scanning a table with more than EXPLAIN_SCAN_ROWS rows fail, with each statement"""
+        with self.assertRaises(AssertionError) as failure:
+            self.check_list("auth", status.HTTP_200_OK)
+        report = str(failure.exception)
+        self.assertIn("Auth user list queries fully scan tables:", report)
+        self.assertRegex(report, r'(?m)^things_thing\s+50\s+SELECT .* WHERE "things_thing"\."name"(::text)? LIKE')
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "PostgreSQL plans only")
+    def test_postgresql_seq_scans(self):
+        """Seq Scan nodes of PostgreSQL plans are full scans, unless an index can be used"""
+        user = self.get_request_user("auth")
+        with CaptureQueriesContext(connection) as queries:
+            list(models.Thing.objects.filter(name__startswith="NAME_"))
+            list(models.Property.objects.filter(creator=user))
+        self.assertEqual(profiling.get_full_scans(connection, queries[0]["sql"]), ["things_thing"])
+        self.assertEqual(profiling.get_full_scans(connection, queries[1]["sql"]), [])
+
+
+class TaskViewSetTest(APITestCase, AuthFullAccess, AdminFullAccess):
+    """
+    Task viewset tests
+    Permission level: IsAuthenticated
+    Tasks and their projects (FK dependency) saved with bulk_create
+    """
+
+    BULK_CREATE = True
+    N_PLUS_ONE_AMOUNTS = (5, 20)
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/tasks/"
+        self.factory = factories.TaskFactory
+        self.model = models.Task
+        self.viewset = views.TaskViewSet
+        self.instance_data = {"name": "test task name", "project": factories.ProjectFactory().pk}
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+
+    def test_bulk_create_saves_fk_dependencies(self):
+        """Tasks and the projects built by their SubFactory are saved"""
+        tasks = self.get_model_instances()
+        self.assertEqual(models.Task.objects.filter(pk__in=[task.pk for task in tasks]).count(), len(tasks))
+        self.assertEqual(models.Project.objects.filter(task__in=tasks).count(), len(tasks))
+
+    def test_bulk_create_fallback_warns(self):
+        """Instances that can't be bulk created are saved one by one, with a warning"""
+
+        def receiver(**kwargs):
+            pass
+
+        signals.post_save.connect(receiver, sender=models.Task)
+        try:
+            with self.assertWarnsRegex(RuntimeWarning, "Task instances can't be bulk created"):
+                tasks = self.get_model_instances()
+        finally:
+            signals.post_save.disconnect(receiver, sender=models.Task)
+        self.assertTrue(all(task.pk for task in tasks))
+
+
+class TaskNoSelectRelatedViewSetTest(APITestCase, BaseDrfTest):
+    """
+    Task viewset without select_related: list queries grow with the tasks
+    """
+
+    N_PLUS_ONE_AMOUNTS = (5, 20)
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/tasks/"
+        self.factory = factories.TaskFactory
+        self.model = models.Task
+        self.viewset = views.TaskNoSelectRelatedViewSet
+        self.user_data = USER_DATA
+
+    def test_list_queries_grow_without_select_related(self):
+        """N+1 queries of the project of each task are reported"""
+        with self.assertRaises(AssertionError) as failure:
+            self.check_list("auth", status.HTTP_200_OK)
+        report = str(failure.exception)
+        self.assertIn("Auth user list queries grow with instances", report)
+        self.assertRegex(report, r'(?m)^5\s+20\s+SELECT .* FROM "things_project"')
+
+    def test_query_budget_fails(self):
+        """Requests above their QUERY_BUDGET fail with the count of each normalized statement"""
+        self.QUERY_BUDGET = {"list": 1}
+        with mock.patch.object(TaskNoSelectRelatedViewSetTest, "EXACT_AMOUNT", 5):
+            with self.assertRaises(AssertionError) as failure:
+                self.check_list("auth", status.HTTP_200_OK)
+        report = str(failure.exception)
+        self.assertIn("Auth user list ran 6 queries, budget is 1:", report)
+        self.assertRegex(report, r'(?m)^5\s+SELECT .* FROM "things_project" WHERE .*"id" = \? LIMIT \?$')
+        self.assertRegex(report, r'(?m)^1\s+SELECT .* FROM "things_task"$')
+        self.assertEqual(report.count('FROM "things_project"'), 1)
+
+
+class ProjectViewSetTest(APITestCase, AuthOwner, AdminFullAccess):
+    """
+    Auth Only.
+    Projects owned by their members (many-to-many owner path)
+    """
+
+    REQUEST_FORMAT = "json"
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/projects/"
+        self.factory = factories.ProjectFactory
+        self.model = models.Project
+        self.viewset = views.ProjectViewSet
+        self.instance_data = {"name": "test project name"}
+        self.user_data = USER_DATA
+        self.admin_data = ADMIN_DATA
+        self.USER_FIELD_NAME = "members"
+
+
+class TaskOwnedViewSetTest(
+    APITestCase, auth.CanListOwned, auth.CanRetrieveOwned, auth.CanUpdateOwned, auth.CanDestroyOwned
+):
+    """
+    Auth Only.
+    Tasks owned by the owner of their project (nested owner path)
+    """
+
+    FOREIGN_MIX_AMOUNT = 200
+
+    def setUp(self):
+        """Tests setup"""
+        self.endpoint = "/api/v1/tasks/"
+        self.factory = factories.TaskFactory
+        self.model = models.Task
+        self.viewset = views.TaskOwnedViewSet
+        self.instance_data = {"name": "test task name", "project": factories.ProjectFactory().pk}
+        self.user_data = USER_DATA
+        self.USER_FIELD_NAME = "project__owner"
+
+
+class AssignOwnerTest(TestCase):
+    """
+    Queries assigning an owner through each kind of owner path
+    """
+
+    def setUp(self):
+        self.user = create_user(USER_DATA)
+        self.tasks = create_instances(factories.TaskFactory, 5, bulk=True)
+
+    def test_nested_owner_is_one_update(self):
+        """Owner of related instances: one UPDATE with a subquery"""
+        with self.assertNumQueries(1):
+            assign_owner(self.tasks, "project__owner", self.user)
+        self.assertEqual(models.Task.objects.filter(project__owner=self.user).count(), len(self.tasks))
+
+    def test_many_to_many_owner_is_one_insert(self):
+        """Many-to-many owner: one bulk insert"""
+        projects = [task.project for task in self.tasks]
+        with self.assertNumQueries(1):
+            assign_owner(projects, "members", self.user)
+        self.assertEqual(models.Project.objects.filter(members=self.user).count(), len(projects))
+
+    def test_nested_many_to_many_owner(self):
+        """Many-to-many owner of related instances: a SELECT of the related instances, and one bulk insert"""
+        with self.assertNumQueries(2):
+            assign_owner(self.tasks, "project__members", self.user)
+        self.assertEqual(models.Task.objects.filter(project__members=self.user).count(), len(self.tasks))
+
+
+class ThingViewSetLoadTest(load.LoadTestCase):
+    """
+    Thing viewset under concurrent load
+    Permission level: IsAuthenticated
+    """
+
+    LOAD_TEST_CLASS = ThingViewSetTest
+    LOAD_REQUESTS = 20
+    LOAD_CONCURRENCY = 4
+
+
+class ThingCursorViewSetLoadTest(load.LoadTestCase):
+    """
+    Thing viewset with cursor pagination under concurrent load
+    Pages are requested with the page size query param of the paginator
+    """
+
+    LOAD_TEST_CLASS = ThingCursorViewSetTest
+    LOAD_REQUESTS = 10
+    LOAD_CONCURRENCY = 2
@@ -1,13 +1,26 @@
 from example_one.permissions import CreatorPermission
 from rest_framework import viewsets
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination, PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 
-from .models import Property, Thing
-from .serializers import PropertySerializer, ThingSerializer
+from .models import Project, Property, Task, Thing
+from .serializers import ProjectSerializer, PropertySerializer, TaskSerializer, ThingSerializer
 
 # Create your views here.
 
 
+class ThingCursorPagination(CursorPagination):
+
+    ordering = "pk"
+    page_size = 10
+    page_size_query_param = "page_size"
+
+
+class ThingPageNumberPagination(PageNumberPagination):
+
+    page_size = 20
+
+
 class ThingViewSet(viewsets.ModelViewSet):
 
     queryset = Thing.objects.all()
@@ -35,6 +48,45 @@ class ThingViewSet3(viewsets.ModelViewSet):
     ]
 
 
+class ThingPaginatedViewSet(viewsets.ModelViewSet):
+
+    queryset = Thing.objects.order_by("pk")
+    serializer_class = ThingSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+    pagination_class = LimitOffsetPagination
+
+
+class ThingPageNumberViewSet(viewsets.ModelViewSet):
+
+    queryset = Thing.objects.order_by("pk")
+    serializer_class = ThingSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+    pagination_class = ThingPageNumberPagination
+
+
+class ThingCursorViewSet(viewsets.ModelViewSet):
+
+    queryset = Thing.objects.all()
+    serializer_class = ThingSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+    pagination_class = ThingCursorPagination
+
+
+class ThingNamePrefixViewSet(ThingViewSet):
+    """
+    Things whose name starts with the name query param (name is not indexed)
+    """
+
+    def get_queryset(self):
+        return Thing.objects.filter(name__startswith=self.request.query_params.get("name", ""))
+
+
 # PROPERTY VIEWSETS
 
 
@@ -46,3 +98,77 @@ class PropertyViewSet(viewsets.ModelViewSet):
         IsAuthenticated,
         CreatorPermission,
     ]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_superuser or user.is_staff:
+            return Property.objects.all()
+        return Property.objects.filter(creator=user)
+
+
+class PropertyLeakyViewSet(PropertyViewSet):
+    """
+    Lists the properties of every user
+    """
+
+    def get_queryset(self):
+        return Property.objects.all()
+
+
+class PropertyPythonFilterViewSet(PropertyViewSet):
+    """
+    Lists the properties of the user, filtered in Python from every property
+    """
+
+    def get_queryset(self):
+        return [prop for prop in Property.objects.all() if prop.creator_id == self.request.user.pk]
+
+
+# PROJECT VIEWSETS
+
+
+class ProjectViewSet(viewsets.ModelViewSet):
+    """
+    Projects of their members (many-to-many owner)
+    """
+
+    queryset = Project.objects.all()
+    serializer_class = ProjectSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_superuser:
+            return Project.objects.all()
+        return Project.objects.filter(members=user)
+
+
+# TASK VIEWSETS
+
+
+class TaskViewSet(viewsets.ModelViewSet):
+
+    queryset = Task.objects.select_related("project")
+    serializer_class = TaskSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+
+class TaskNoSelectRelatedViewSet(TaskViewSet):
+    """
+    Serializes the name of the project of each task with one query per task (N+1 queries)
+    """
+
+    queryset = Task.objects.all()
+
+
+class TaskOwnedViewSet(TaskViewSet):
+    """
+    Tasks of the projects of their owner (nested owner)
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(project__owner=self.request.user)